@@ -86,8 +86,9 @@ class HSDBAttribute(HSDBField):
 
     def __get__(self, instance, owner):
         if self._wrapper is None: # Lazy loading of the wrapper
-            value = instance.__dict__['_fields'].get(self.key)
-            self._wrapper = self._AttributeWrapper(value.value, self)
+            # Reading the backing slots directly, the key/value properties would cost an extra frame each
+            value = instance._fields[instance._field_index[self._key]]
+            self._wrapper = self._AttributeWrapper(value._value, self)
         return self._wrapper
     
     def _validate_key(self, key):
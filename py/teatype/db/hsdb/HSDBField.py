@@ -27,6 +27,21 @@ _AVAILABLE_FIELDS = [
 # Type alias for attribute types
 T = TypeVar('T')
 
+class _MetadataProperty:
+    """
+    Non-data descriptor that resolves a metadata field of a value wrapper on first access.
+    The resolved value is stored in the instance dict, shadowing the descriptor from then on.
+    """
+    def __init__(self, prop:str) -> None:
+        self.prop = prop
+        
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance._load_metadata().get(self.prop)
+        instance.__dict__[self.prop] = value
+        return value
+
 # TODO: Try to do automatic type checking and assignment in ValueWrapper as well
 # TODO: Implement support for dicts and lists (potentially dangerous though)
 class HSDBField(ABC, Generic[T]):
@@ -149,9 +164,9 @@ class HSDBField(ABC, Generic[T]):
             # Dynamically create properties that fetch from metadata
             for prop in (_AVAILABLE_FIELDS + additional_available_fields):
                 self.cache_values[prop] = getattr(self._field, prop)
-                # Create a property for each available field
+                # Create a non-data descriptor for each available field
                 # This allows us to access the metadata without needing to call a method
-                setattr(self.__class__, prop, property(lambda self, p=prop: self._load_metadata().get(p)))
+                setattr(self.__class__, prop, _MetadataProperty(prop))
                 
             # Dynamically create function aliases
             for func in available_functions:
@@ -190,7 +205,4 @@ class HSDBField(ABC, Generic[T]):
                     
                 del self.cache_values
                 self._metadata_loaded = True
-            return self._cached_metadata
-        
-        def __getattribute__(self, name):
-            return super().__getattribute__(name)
\ No newline at end of file
+            return self._cached_metadata
\ No newline at end of file
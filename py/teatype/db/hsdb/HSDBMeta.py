@@ -11,20 +11,48 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
+import sys
 from abc import ABCMeta
 # Third-party imports
 from teatype.db.hsdb import HSDBAttribute
+from teatype.toolkit import kebabify
 
 class HSDBMeta(ABCMeta):
     """
     Metaclass to collect HSDBAttributes from the class definition.
     """
-    def __new__(cls, name, bases, dct):
+    def __new__(cls, name, bases, dct, slots:bool=False):
+        # Inherit the fields already collected on the bases, so subclasses don't need to re-declare them
         fields = {}
-        for attr_name, attr_value in dct.items():
-            if isinstance(attr_value, HSDBAttribute):
-                attr_value.name = attr_name
-                fields[attr_name] = attr_value
+        for base in reversed(bases):
+            fields.update(getattr(base, '_declared_fields', {}))
+        
+        # Fast path for intermediate classes that don't declare any attributes themselves,
+        # any() bails out on the first hit so the full walk only happens for actual models
+        if any(isinstance(attr_value, HSDBAttribute) for attr_value in dct.values()):
+            for attr_name, attr_value in dct.items():
+                if isinstance(attr_value, HSDBAttribute):
+                    attr_value.name = attr_name
+                    fields[attr_name] = attr_value
 
-        dct['_fields'] = fields
-        return super().__new__(cls, name, bases, dct)
\ No newline at end of file
+        # Kept apart from the per-instance _fields slot of HSDBModel, which holds the field values,
+        # so models don't need a per-instance __dict__
+        dct['_declared_fields'] = fields
+        # Slotted models are opt-in (class MyModel(HSDBModel, slots=True)), they drop the per-instance __dict__,
+        # so only declared attributes can be set on their instances
+        if slots:
+            dct.setdefault('__slots__', ())
+        model = super().__new__(cls, name, bases, dct)
+        
+        # Model name and pluralization only depend on the class, so they are computed once here
+        model.model = model
+        # Interned, so the model-name keyed indices compare names by identity
+        model.model_name = sys.intern(name)
+        model.resource_name = kebabify(name, remove='-model', plural=False)
+        model.resource_name_plural = kebabify(name, remove='-model', plural=True)
+        model._path_prefix = f'{model.resource_name_plural}/'
+        
+        # Resolving the attribute cache eagerly, so instances never have to check for it
+        if hasattr(model, '_cache_attributes'):
+            model._cache_attributes()
+        return model
\ No newline at end of file
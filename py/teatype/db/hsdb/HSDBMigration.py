@@ -12,6 +12,7 @@
 
 # Standard-library imports
 import json
+import os
 import re
 from abc import ABC, abstractmethod
 from typing import List
@@ -166,8 +167,10 @@ class HSDBMigration(ABC):
         log('Final summary (index):')
         for migration_data_key in self._migration_data['index']:
             print(f'    Migrated {migration_data_key}: {len(self._migration_data["index"][migration_data_key])}')
+            # Building the per-model directory prefix once instead of joining the path for every entry
+            migration_prefix = self._index_path + os.sep + migration_data_key + os.sep
             for migration_entry in self._migration_data['index'][migration_data_key]:
-                migration_entry_path = path.join(self._index_path, migration_data_key, migration_entry['base_data']['id'] + '.json')
+                migration_entry_path = migration_prefix + migration_entry['base_data']['id'] + '.json'
                 file.write(migration_entry_path,
                             migration_entry,
                             force_format='json',
@@ -175,11 +178,19 @@ class HSDBMigration(ABC):
         println()
         for rejectpile_key in self._rejectpile['index']:
             print(f'    Rejected {rejectpile_key}: {len(self._rejectpile["index"][rejectpile_key])}')
+            rejectpile_source_prefix = self._index_path + os.sep + rejectpile_key + os.sep
+            rejectpile_target_prefix = self._rejectpile_index_path + os.sep + rejectpile_key + os.sep
+            os.makedirs(rejectpile_target_prefix, exist_ok=True)
             for rejectpile_entry in self._rejectpile['index'][rejectpile_key]:
                 id = rejectpile_entry['data']['base_data']['id']
-                rejectpile_source_path = path.join(self._index_path, rejectpile_key, id + '.json')
-                rejectpile_target_path = path.join(self._rejectpile_index_path, rejectpile_key, id + '.json')
-                file.move(rejectpile_source_path, rejectpile_target_path)
+                rejectpile_source_path = rejectpile_source_prefix + id + '.json'
+                rejectpile_target_path = rejectpile_target_prefix + id + '.json'
+                try:
+                    # Both paths live under the hsdb root, so a rename is a single atomic syscall
+                    os.replace(rejectpile_source_path, rejectpile_target_path)
+                except OSError:
+                    # Fall back to copy + unlink for cross-device setups (e.g. rejectpile on a separate mount)
+                    file.move(rejectpile_source_path, rejectpile_target_path)
         println()
         
         # TODO: Write migration for rawfiles data
@@ -17,9 +17,22 @@ from abc import ABC
 from typing import List
 
 # Third-party imports
+import orjson
 from teatype.db.hsdb import HSDBAttribute, HSDBMeta, HSDBQuery, HSDBRelation
 from teatype.toolkit import dt, staticproperty
-from teatype.toolkit import generate_id, kebabify
+from teatype.toolkit import generate_id
+
+# Per-instance state that is reset when cloning a class-level attribute for a model instance
+_TEMPLATE_EXCLUDED_KEYS = frozenset(['_cached_value', '_instance_template', '_key', '_value', '_wrapper', 'name'])
+# Datetimes are handed to str() like the stdlib encoder does, instead of orjson's own ISO format
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+
+def _dump_json(data:dict) -> str:
+    try:
+        return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS).decode()
+    except TypeError:
+        # orjson rejects a few things the stdlib still encodes (integers beyond 64 bit, non-string keys)
+        return json.dumps(data, indent=4, default=str)
 
 # TODO: Implement a short-key map for attributes for compression
 #       - automate by implementing a smart algorithm that first checks how many seperations of underscore are there and then abbreviates that way
@@ -30,9 +43,26 @@ from teatype.toolkit import generate_id, kebabify
 # TODO: Add validation method inside model
 # TODO: Add language supports
 class HSDBModel(ABC, metaclass=HSDBMeta):
+    # Instance state is limited to the field values, the cached serializer output and the entry path,
+    # all naming is class-level. Subclasses declared with slots=True get empty __slots__ injected by HSDBMeta,
+    # so their instances never allocate a __dict__, other subclasses keep one for ad-hoc attributes
+    __slots__ = ('_fields', '_serialized_json', '_serializer_cache', 'path')
+    
     # Private class variables
     # _app_name:str # TODO: Implement these as computed properties
-    _attribute_cache = {} # Cache to store attributes once for each class # TODO: Set to None and then initialize on first access -> lazy initialization
+    _attribute_cache = {} # Cache to store attributes once for each class, filled by HSDBMeta on class creation
+    _attribute_names:frozenset # Names of the HSDBAttributes of the class, relations excluded
+    _attribute_plan:tuple # (required names, (name, type, computed) attributes, (name, type) relations, list relation names)
+    _attribute_slots:tuple # (name, slot) pairs of the HSDBAttributes, in field order
+    _field_index:dict # Slot of every attribute and relation of the class in the instance's _fields list
+    _has_relations:bool # Whether the class declares any relations
+    _indexed_names:frozenset # Names of the attributes maintained in the field index (indexed or unique)
+    _indexed_slots:tuple # (name, slot) pairs of the indexed attributes, walked when (un)indexing an entry
+    _required_names:frozenset # Names of the required, non-computed attributes and required relations
+    _unique_names:frozenset # Names of the unique, non-computed attributes, checked against the field index on creation
+    _path_prefix:str # Relative folder of the model entries, computed once per class by HSDBMeta
+    _relation_names:frozenset # Names of the relations of the class
+    _serializer_cacheable:bool # Whether the class keeps the default serializer, only its output is cached
     # _overwrite_path:str
     # _overwrite_name:str
     # _overwrite_plural_name:str
@@ -64,81 +94,45 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
         # create an instance deepcopy, assign its key to the variable name,
         # and, if the field is provided in the data dict, set its value.
         # Necessary to avoid sharing the same attribute instance across all instances.
-        # Look up cached attributes for this class
-        # Cache the attributes if not already cached
-        if self.__class__ not in self._attribute_cache:
-            self._cache_attributes()
-            
-        # TODO: Make this more efficient since only class needs to know this information
-        # Model name and pluralization
-        self.model_name = type(self).__name__
-        self.model = self.__class__
-        self.resource_name = kebabify(self.model_name, remove='-model', plural=False)
-        self.resource_name_plural = kebabify(self.model_name, remove='-model', plural=True)
-        
-        # Create a dict to hold instance-specific field values
-        self._fields = {}
-        for attribute_name, attribute in self._attribute_cache[self.__class__].items():
-            if isinstance(attribute, HSDBRelation._RelationFactory):
-                if attribute.required and attribute_name not in data:
-                    raise ValueError(f'Model "{self.model_name}" init error: "{attribute_name}" is required')
-                continue
-            
-            if attribute.required and not attribute.computed and attribute_name not in data:
-                raise ValueError(f'Model "{self.model_name}" init error: "{attribute_name}" is required')
-            
+        # Model name, pluralization and the attribute cache are resolved once per class by HSDBMeta
+        
+        required_names, typed_attributes, _, _ = self._attribute_plan
+        
+        # One C-level subset check against the data keys, only resolving which field is missing on failure
+        if not data.keys() >= self._required_names:
+            missing_name = next(attribute_name for attribute_name in required_names if attribute_name not in data)
+            raise ValueError(f'Model "{self.model_name}" init error: "{missing_name}" is required')
+        
+        # Create a list to hold instance-specific field values, one slot per field as assigned in _field_index
+        self._fields = [None] * len(self._field_index)
+        self._serialized_json = None
+        self._serializer_cache = None
+        for attribute_name, attribute_type, computed in typed_attributes:
             if attribute_name in data:
+                attribute_value = data[attribute_name]
                 # Validate type before assignment
-                if not isinstance(data.get(attribute_name), attribute.type):
-                    raise ValueError(f'Field "{attribute_name}" must be of type {attribute.type.__name__}')
-                if attribute.computed:
+                if not isinstance(attribute_value, attribute_type):
+                    raise ValueError(f'Field "{attribute_name}" must be of type {attribute_type.__name__}')
+                if computed:
                     raise ValueError(f'{attribute_name} is computed and cannot be set')
-                setattr(self, attribute_name, data.get(attribute_name))
+                setattr(self, attribute_name, attribute_value)
         
         # TODO: Find a more elegant solution than this ugly a** hack
         # self.id.instance.__computational_override__(generate_id(truncate=5))
-        self.id = generate_id()
-                
-        # Having to initalize lazily, because needing id to properly intialize relations
-        for attribute_name, attribute in self._attribute_cache[self.__class__].items():
-            if isinstance(attribute, HSDBAttribute):
-                continue
-            
-            # Assume that if the attribute is not an HSDBAttribute, it is a relation
-            if attribute_name in data:
-                attribute_value = data.get(attribute_name)
+        entry_id = generate_id()
+        self.id = entry_id
                 
-                if attribute.type == List[str]:
-                    if not all(isinstance(item, str) for item in attribute_value) and \
-                       not all(isinstance(item, HSDBModel) for item in attribute_value) and \
-                       not all(isinstance(item, HSDBAttribute._AttributeWrapper) for item in attribute_value):
-                        raise ValueError(f'Field "{attribute_name}" must be a list of id strings or HSDBModel instances')
-                else:
-                    if not isinstance(attribute_value, attribute.type) and \
-                       not isinstance(attribute_value, HSDBModel) and \
-                       not isinstance(attribute_value, HSDBAttribute._AttributeWrapper):
-                           raise ValueError(f'Field "{attribute_name}" must be of type "{attribute.type.__name__}" or an HSDBModel instance')
-                
-                # Allowing to pass both model instance and id string
-                if isinstance(attribute_value, HSDBModel):
-                    attribute_value = attribute_value.id
-                elif isinstance(attribute_value, list):
-                    # If the attribute is a list of HSDBModel instances, extract their IDs
-                    if all(isinstance(item, HSDBModel) for item in attribute_value):
-                        attribute_value = [item.id for item in attribute_value]
-                    else:
-                        attribute_value = [item for item in attribute_value]
-                    
-                # Initialize the relation lazily
-                setattr(self, attribute_name, attribute_value)
+        # Having to initalize lazily, because needing id to properly intialize relations,
+        # most models don't declare any relations though and most data doesn't carry any relation keys,
+        # skipping the relation initialization entirely then
+        if self._has_relations and not data.keys().isdisjoint(self._relation_names):
+            self._init_relations(data)
         
         current_time = dt.now()
         self.created_at = current_time
         self.updated_at = current_time
             
-        if overwrite_path:
-            self.path = overwrite_path
-        self.path = f'{self.resource_name_plural}/{self.id}.json'
+        self.path = overwrite_path or (self._path_prefix + entry_id + '.json')
         
         # TODO: Make this dynamic
         # self.app_name = 'raw'
@@ -150,8 +144,9 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
             id_val = self.id._value if hasattr(self.id, '_value') else str(self.id)
             # Get a few key fields for preview
             preview_fields = []
-            for attr_name in list(self._fields.keys())[:3]:
-                if attr_name not in ('id', 'created_at', 'updated_at'):
+            fields = self._fields
+            for attr_name, slot in self._field_index.items():
+                if fields[slot] is not None and attr_name not in ('id', 'created_at', 'updated_at'):
                     try:
                         val = getattr(self, attr_name)
                         val = val._value if hasattr(val, '_value') else val
@@ -170,10 +165,16 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
     
     def __getattribute__(self, name):
         # If the field name is in our field cache, return the value from _fields
-        _cache = object.__getattribute__(self, '_attribute_cache')
         model = type(self)
-        if model in _cache and name in _cache[model]:
-            return object.__getattribute__(self, '_fields').get(name).__get__(self, self.__class__)
+        slot = model._field_index.get(name)
+        if slot is not None:
+            field = object.__getattribute__(self, '_fields')[slot]
+            # Once a field has built its wrapper the descriptor call is skipped, attributes hand out
+            # the wrapper itself while relations hand out the related entry it resolved
+            wrapper = field._wrapper
+            if wrapper is not None:
+                return wrapper if name in model._attribute_names else wrapper._value
+            return field.__get__(self, model)
         return object.__getattribute__(self, name)
 
     def __setattr__(self, name, value):
@@ -192,11 +193,9 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
         if name in _cache:
             attribute = _cache[name]
             if isinstance(attribute, HSDBAttribute):
-                instance_attribute = HSDBAttribute(
-                    attribute.type, 
-                    **{key: value for key, value in vars(attribute).items() if key not in [
-                        'name', 'type', '_cached_value', '_key', '_value', '_wrapper']} # Exclude these keys
-                )
+                # Cloning from the prebuilt template, the class-level attribute has already been validated
+                instance_attribute = HSDBAttribute.__new__(HSDBAttribute)
+                instance_attribute.__dict__.update(attribute._instance_template)
                 instance_attribute.key = attribute.name
                 instance_attribute.value = value
             elif isinstance(attribute, HSDBRelation._RelationFactory):
@@ -211,26 +210,128 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
                 )
                 instance_attribute.key = name
                 instance_attribute.value = instance_attribute._value
-            self.__dict__.setdefault('_fields', {})[name] = instance_attribute
+            object.__getattribute__(self, '_fields')[type(self)._field_index[name]] = instance_attribute
+            # Any field change invalidates the cached serializer output and its JSON dump
+            object.__setattr__(self, '_serialized_json', None)
+            object.__setattr__(self, '_serializer_cache', None)
         else:
             super().__setattr__(name, value)
     
-    # TODO: Optimization
-    def _cache_attributes(self):
+    @classmethod
+    def _cache_attributes(cls):
         """
         Cache the attributes for this class (including its ancestors).
+        Called once by HSDBMeta when the class is created.
         """
-        self._attribute_cache[self.__class__] = {}
+        cls._attribute_cache[cls] = {}
         seen = set()
 
         # Traverse through the method resolution order to gather attributes
-        for model in reversed(self.__class__.__mro__):
+        for model in reversed(cls.__mro__):
             for attribute_name, attribute in model.__dict__.items():
                 if attribute_name in seen:
                     continue
                 if isinstance(attribute, HSDBAttribute) or isinstance(attribute, HSDBRelation._RelationFactory):
                     seen.add(attribute_name)
-                    self._attribute_cache[self.__class__][attribute_name] = attribute
+                    cls._attribute_cache[cls][attribute_name] = attribute
+                    if isinstance(attribute, HSDBAttribute) and '_instance_template' not in attribute.__dict__:
+                        # Instance state of a freshly constructed copy of this attribute, used by __setattr__
+                        attribute._instance_template = {
+                            **{key: value for key, value in vars(attribute).items() if key not in _TEMPLATE_EXCLUDED_KEYS},
+                            '_cached_value': None,
+                            '_key': None,
+                            '_value': attribute.default,
+                            '_wrapper': None,
+                            'name': None
+                        }
+        
+        # Every field gets a fixed slot in the instance's _fields list, indexing a list skips hashing the name
+        cls._field_index = {attribute_name: slot for slot, attribute_name in enumerate(cls._attribute_cache[cls])}
+        # Indexed and unique attributes are kept in the field index for O(1) equality lookups. Computed attributes
+        # are left out, the id already keys the primary index and would only be stored a second time
+        cls._indexed_names = frozenset(attribute_name for attribute_name, attribute in cls._attribute_cache[cls].items()
+                                       if isinstance(attribute, HSDBAttribute) and (attribute.indexed or attribute.unique)
+                                       and not attribute.computed)
+        cls._indexed_slots = tuple((attribute_name, cls._field_index[attribute_name]) for attribute_name in sorted(cls._indexed_names))
+        # The class defining _cache_attributes (HSDBModel) owns the default serializer, any other owner is an override
+        serializer_owner = next(model for model in cls.__mro__ if 'serializer' in model.__dict__)
+        cls._serializer_cacheable = '_cache_attributes' in serializer_owner.__dict__
+        # Computed unique attributes (the id) are generated unique, only set values need a conflict check
+        cls._unique_names = frozenset(attribute_name for attribute_name, attribute in cls._attribute_cache[cls].items()
+                                      if isinstance(attribute, HSDBAttribute) and attribute.unique and not attribute.computed)
+        
+        # Flattening the class-constant parts of the attributes into an init plan,
+        # so instantiation only iterates tight tuples instead of branching per attribute
+        required_names = []
+        typed_attributes = []
+        scalar_relations = []
+        list_relations = []
+        for attribute_name, attribute in cls._attribute_cache[cls].items():
+            if isinstance(attribute, HSDBRelation._RelationFactory):
+                if attribute.required:
+                    required_names.append(attribute_name)
+                if attribute.type == List[str]:
+                    list_relations.append(attribute_name)
+                else:
+                    scalar_relations.append((attribute_name, attribute.type))
+            else:
+                if attribute.required and not attribute.computed:
+                    required_names.append(attribute_name)
+                typed_attributes.append((attribute_name, attribute.type, attribute.computed))
+        cls._required_names = frozenset(required_names)
+        cls._attribute_plan = (tuple(required_names),
+                               tuple(typed_attributes),
+                               tuple(scalar_relations),
+                               tuple(list_relations))
+        cls._has_relations = bool(scalar_relations or list_relations)
+        cls._relation_names = frozenset(list_relations).union(attribute_name for attribute_name, _ in scalar_relations)
+        cls._attribute_names = frozenset(attribute_name for attribute_name, _, _ in typed_attributes)
+        # Settable attributes come first, keeping serialized entries led by their data instead of the computed fields
+        cls._attribute_slots = tuple((attribute_name, cls._field_index[attribute_name])
+                                     for attribute_name, _, computed in sorted(typed_attributes, key=lambda plan: plan[2]))
+                    
+    def _init_relations(self, data:dict) -> None:
+        """
+        Initialize the relations provided in data, requires the id to be set already.
+        """
+        _, _, scalar_relations, list_relations = self._attribute_plan
+        for attribute_name, attribute_type in scalar_relations:
+            if attribute_name in data:
+                attribute_value = data[attribute_name]
+                if not isinstance(attribute_value, (attribute_type, HSDBModel, HSDBAttribute._AttributeWrapper)):
+                    raise ValueError(f'Field "{attribute_name}" must be of type "{attribute_type.__name__}" or an HSDBModel instance')
+                
+                # Allowing to pass both model instance and id string
+                if isinstance(attribute_value, HSDBModel):
+                    attribute_value = attribute_value.id
+                    
+                # Initialize the relation lazily
+                setattr(self, attribute_name, attribute_value)
+        
+        for attribute_name in list_relations:
+            if attribute_name in data:
+                attribute_value = data[attribute_name]
+                # The first item decides the item kind, all items then have to match it in a single pass
+                item_type = None
+                if attribute_value:
+                    first_item = attribute_value[0]
+                    if isinstance(first_item, str):
+                        item_type = str
+                    elif isinstance(first_item, HSDBModel):
+                        item_type = HSDBModel
+                    else:
+                        item_type = HSDBAttribute._AttributeWrapper
+                    if not all(isinstance(item, item_type) for item in attribute_value):
+                        raise ValueError(f'Field "{attribute_name}" must be a list of id strings or HSDBModel instances')
+                
+                # If the attribute is a list of HSDBModel instances, extract their IDs
+                if item_type is HSDBModel:
+                    attribute_value = [item.id for item in attribute_value]
+                else:
+                    attribute_value = [item for item in attribute_value]
+                    
+                # Initialize the relation lazily
+                setattr(self, attribute_name, attribute_value)
                     
     @property
     def serializer(self) -> dict:
@@ -238,14 +339,22 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
         If this method is not overridden, collect all HSDBAttribute fields.
         If this method is overridden, collect all fields that are not computed.
         """
-        serialized = dict()
-        for attribute_name in self.__dict__['_fields']:
-            # Skip non-HSDBAttribute fields
-            try:
-                if attribute_name in self._fields:
-                    serialized[attribute_name] = getattr(self, attribute_name)._value
-            except Exception as exc:
-                continue
+        # Callers get their own copy, the cached dict stays private to serialize()
+        return self._cached_serializer().copy()
+    
+    def _cached_serializer(self) -> dict:
+        """
+        Output of the default serializer, built once per field state. Every field assignment
+        through __setattr__ resets the cache, the returned dict must not be mutated.
+        """
+        serialized = self._serializer_cache
+        if serialized is None:
+            # Skip non-HSDBAttribute fields and unset slots, the set values are read straight from the instance attributes
+            fields = self._fields
+            serialized = {attribute_name: fields[slot]._value
+                          for attribute_name, slot in self._attribute_slots
+                          if fields[slot] is not None}
+            self._serializer_cache = serialized
         return serialized
         
     @staticproperty
@@ -286,7 +395,18 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
         Returns:
             Serialized dict or JSON string
         """
-        serialized_data = instance.serializer.copy()
+        # Overridden serializers may compute values outside __setattr__, their output is never cached
+        cacheable = instance._serializer_cacheable
+        
+        # Plain JSON dumps are cached next to the serializer output, so repeated scans skip the encoding
+        if cacheable and json_dump and not (include_relations or expand_relations):
+            serialized_json = instance._serialized_json
+            if serialized_json is None:
+                serialized_json = _dump_json(instance._cached_serializer())
+                instance._serialized_json = serialized_json
+            return serialized_json
+        
+        serialized_data = instance._cached_serializer().copy() if cacheable else instance.serializer.copy()
         
         # Handle relations
         if include_relations or expand_relations:
@@ -332,15 +452,17 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
                             serialized_data[attr_name] = None
         
         if json_dump:
-            return json.dumps(serialized_data, indent=4, default=str)
+            return _dump_json(serialized_data)
         return serialized_data
     
     def snapshot(self) -> dict:
         snapshot_dict = {}
-        for key, value in self.__dict__.items():
-            # TODO: If variable is of type HSDBAttribute
-            if isinstance(value, dt):
-                snapshot_dict[key] = str(value)
+        # The values live in the _fields slot, never in an instance __dict__
+        fields = self._fields
+        for key, slot in self._field_index.items():
+            attribute = fields[slot]
+            if attribute is not None and isinstance(attribute._value, dt):
+                snapshot_dict[key] = str(attribute._value)
         return snapshot_dict
     
     def save(self) -> 'HSDBModel':
@@ -350,6 +472,9 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
         
         Returns:
             The saved model instance
+            
+        Raises:
+            ValueError: If a new instance holds a unique value that is already taken
         """
         from teatype.db.hsdb import HybridStorage
         storage = HybridStorage.instance()
@@ -359,10 +484,10 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
             # Update existing
             storage.index_db.update_entry(entry_id, self.serializer)
         else:
-            # Add new
-            storage.index_db._db.add(entry_id, self)
-            storage.index_db._add_to_model_index(self.model_name, entry_id)
-            storage.index_db._index_entry_fields(self)
+            # Add new, through the insert path of create_entry, so unique values are checked and the entry is accounted
+            conflicting_entry, return_code = storage.index_db._insert_entry(self)
+            if return_code == 409:
+                raise ValueError(f'Entry conflicts with existing entry {conflicting_entry.id} on a unique attribute')
         
         return self
     
@@ -487,13 +612,18 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
         from teatype.db.hsdb import HybridStorage
         storage = HybridStorage.instance()
         
-        # Try indexed lookup first
-        entry_ids = storage.index_db.lookup_by_field(cls.__name__, field, value)
-        if entry_ids:
+        # The id keys the primary index itself
+        if field == 'id':
+            entry = storage.index_db._db.primary_index.get(str(value))
+            return [entry] if entry is not None and entry.model is cls else []
+        
+        # Indexed fields are answered by the field index alone
+        if field in cls._indexed_names:
+            entry_ids = storage.index_db.lookup_by_field(cls.__name__, field, value)
             return [storage.index_db.fetch_entry(eid) for eid in entry_ids]
         
         # Fall back to query
-        return list(cls.query.where(field).equals(value).all())
+        return list(cls.query.where(field).equals(value).collect())
     
     @classmethod
     def count(cls) -> int:
@@ -521,12 +651,11 @@ class HSDBModel(ABC, metaclass=HSDBMeta):
             Dictionary describing the model structure
         """
         from teatype.db.hsdb import HSDBAttribute, HSDBRelation
-        from teatype.toolkit import kebabify
         
         schema = {
             'model_name': cls.__name__,
-            'resource_name': kebabify(cls.__name__, remove='-model', plural=False),
-            'resource_name_plural': kebabify(cls.__name__, remove='-model', plural=True),
+            'resource_name': cls.resource_name,
+            'resource_name_plural': cls.resource_name_plural,
             'attributes': {},
             'relations': {}
         }
@@ -11,8 +11,10 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
+import heapq
 import re
-from functools import reduce
+from functools import lru_cache
+from operator import attrgetter, eq
 from pprint import pprint
 from typing import Dict, List, Union
 from urllib.parse import parse_qs, urlencode
@@ -36,13 +38,81 @@ _RESERVED_PARAMS = {'sort', 'order', 'page', 'page_size', 'limit', 'offset',
 # Operator pattern for parsing: field__op=value or field=value (default: equals)
 _OPERATOR_PATTERN = re.compile(r'^(.+?)__(eq|ne|gt|gte|lt|lte|contains|in)$')
 
+# Minimum ratio of queryset size to requested entries before ordering switches from a full to a partial sort
+_PARTIAL_SORT_RATIO = 4
+
+# Comparison functions for the condition operators, ordering operators never match missing values
+_OPERATORS = {
+    '==': eq,
+    '<': lambda actual, expected: actual is not None and actual < expected,
+    '>': lambda actual, expected: actual is not None and actual > expected,
+    '<=': lambda actual, expected: actual is not None and actual <= expected,
+    '>=': lambda actual, expected: actual is not None and actual >= expected,
+    '∋': lambda actual, expected: expected in actual if isinstance(actual, list) else False
+}
+
+# Candidate count from which numeric conditions are evaluated column-wise with NumPy instead of per entry
+_VECTORIZE_THRESHOLD = 10000
+
+# Names of the NumPy counterparts of the comparison operators, NaN (missing float values) never matches
+_VECTORIZED_OPERATORS = {
+    '==': 'equal',
+    '<': 'less',
+    '>': 'greater',
+    '<=': 'less_equal',
+    '>=': 'greater_equal'
+}
+
+_NUMPY = None # NumPy module once imported, False if it is not installed
+
+def _numpy():
+    """
+    Import NumPy on the first columnar evaluation, it is an optional dependency only large queries use.
+    """
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+            _NUMPY = numpy
+        except ImportError:
+            _NUMPY = False
+    return _NUMPY
+
+@lru_cache(maxsize=256)
+def _compile_getter(attribute_path:str):
+    """
+    Build an accessor for a (nested) attribute path that unwraps the field value.
+    Entries are always model instances, so the whole path is traversed by a single attrgetter.
+    Paths are constant strings set by where() and sort_by(), so each accessor is built once per path.
+    """
+    getter = attrgetter(attribute_path)
+    def get_value(entry) -> any:
+        try:
+            value = getter(entry)
+        except AttributeError:
+            # Missing attributes along the path resolve to None
+            return None
+        return value._value if hasattr(value, '_value') else value
+    return get_value
+
+def _order(queryset:list, key, reverse:bool, limit:int=None) -> list:
+    """
+    Order the queryset by key, if a limit is given only the leading entries are selected.
+    heapq.nsmallest/nlargest are equivalent to sorted(...)[:limit], ties keep their order.
+    """
+    if limit is not None:
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(limit, queryset, key=key)
+    queryset.sort(key=key, reverse=reverse)
+    return queryset
+
 # TODO: Add support for running queries on querysets again after execution to allow reducing even further after initial query
 class HSDBQuery:
     _conditions:List
     _current_attribute:str
     _executed_hook:str
     _filter_key:str
-    _hsdb_reference:object # HybridStorage, avoiding import loop
+    _hsdb_reference:object = None # HybridStorage singleton, resolved once and shared by all queries
     _measure_time:bool
     _pagination:Union[int, int]
     _print:bool
@@ -65,7 +135,9 @@ class HSDBQuery:
         self._current_attribute = None
         self._executed_hook = None
         self._filter_key = None
-        self._hsdb_reference = HybridStorage()
+        if HSDBQuery._hsdb_reference is None:
+            # Resolving the singleton on first use, calling HybridStorage() per query takes the singleton lock every time
+            HSDBQuery._hsdb_reference = HybridStorage()
         self._measure_time = False
         self._pagination = None
         self._print = False
@@ -319,6 +391,89 @@ class HSDBQuery:
         self._conditions.append((self._current_attribute, op, value))
         self._current_attribute = None
         
+    def _compile_predicate(self, conditions:List[tuple]):
+        """
+        Compile the conditions into a single predicate, so paths are split and operators
+        are resolved once per query execution instead of once per entry and condition.
+        """
+        compiled_conditions = []
+        for attribute, operator, expected in conditions:
+            if operator not in _OPERATORS:
+                raise ValueError(f'Unsupported operator {operator}')
+            compiled_conditions.append((_compile_getter(attribute), _OPERATORS[operator], expected))
+        compiled_conditions = tuple(compiled_conditions)
+        
+        def predicate(entry) -> bool:
+            for get_value, compare, expected in compiled_conditions:
+                if not compare(get_value(entry), expected):
+                    return False
+            return True
+        return predicate
+    
+    def _vectorizable(self, conditions:List[tuple]) -> bool:
+        """
+        Check if all conditions compare a top-level int or float attribute against a number of the same type,
+        only those can be evaluated on a NumPy column without changing the result.
+        Mixed comparisons stay on the per-entry path, an int64 column compared with a float is
+        cast to float64 and loses the exact integer comparison Python does (2**53 + 1 == 2.0**53).
+        """
+        attributes = self.model._attribute_cache.get(self.model, {})
+        for attribute, operator, expected in conditions:
+            if operator not in _VECTORIZED_OPERATORS or attribute not in self.model._attribute_names:
+                return False
+            attribute_type = attributes[attribute].type
+            if attribute_type not in (int, float) or type(expected) is not attribute_type:
+                return False
+        return True
+    
+    def _columnar_mask(self, entries:list, conditions:List[tuple]):
+        """
+        Evaluate the conditions column by column, returns a boolean mask over the entries.
+        Returns None if NumPy is not installed or a column can't be evaluated (missing ints, out of int64 range
+        or values NumPy can't compare), the caller then falls back to the per-entry predicate.
+        """
+        np = _numpy()
+        if not np:
+            return None
+        attributes = self.model._attribute_cache[self.model]
+        mask = np.ones(len(entries), dtype=np.bool_)
+        columns = {}
+        for attribute, operator, expected in conditions:
+            column = columns.get(attribute)
+            if column is None:
+                # Missing floats become NaN, missing ints can't be represented and abort the columnar path
+                dtype = np.int64 if attributes[attribute].type is int else np.float64
+                slot = self.model._field_index[attribute]
+                try:
+                    column = np.array([entry._fields[slot]._value for entry in entries], dtype=dtype)
+                except (AttributeError, KeyError, OverflowError, TypeError, ValueError):
+                    return None
+                columns[attribute] = column
+            try:
+                mask &= getattr(np, _VECTORIZED_OPERATORS[operator])(column, expected)
+            except (TypeError, ValueError): # UFuncTypeError is a TypeError
+                return None
+        return mask
+        
+    def _sort_queryset(self, queryset:list) -> list:
+        """
+        Sort the queryset by the sort key. If only a leading page is requested and it is small
+        compared to the queryset, just the entries up to the end of that page are selected.
+        """
+        reverse = self._sort_order == 'desc'
+        limit = None
+        if self._pagination and self._pagination[0] >= 0:
+            page, page_size = self._pagination
+            if (page + 1) * page_size * _PARTIAL_SORT_RATIO <= len(queryset):
+                limit = (page + 1) * page_size
+        try:
+            # Extracting the wrapped value with a C-level attrgetter, no Python frame per entry
+            return _order(queryset, attrgetter(self._sort_key + '._value'), reverse, limit)
+        except AttributeError:
+            # Missing or plain attributes (and id results) fall back to the None-tolerant getter,
+            # a failing key function leaves the queryset untouched
+            return _order(queryset, _compile_getter(self._sort_key), reverse, limit)
+        
     def _block_executed_query(self, include_pending_condition:bool=False):
         # Including this check to prevent repetition of unnecessary code since all methods need to check for ran query anyways
         if include_pending_condition:
@@ -343,8 +498,12 @@ class HSDBQuery:
             List of identifiers that match the query if self._return_ids is True.
             List of entry that match the query if self._return_ids is False.
             """
-            # Check if the database is empty
-            if not self._hsdb_reference.index_db._db:
+            # The indices hand out copies of their id sets under their own locks, all filtering, sorting
+            # and pagination below runs on those snapshots and the entry dict without holding any lock
+            index_db = self._hsdb_reference.index_db
+            
+            # Check if the database is empty, reading the entry dict directly instead of the locked __len__
+            if not index_db._db.primary_index:
                 raise KeyError('No db entries found')
                 
             if self._verbose and self._measure_time:
@@ -352,112 +511,98 @@ class HSDBQuery:
             
             if id:
                 print('fetch')
-                queryset = [self._hsdb_reference.index_db._db.fetch(id)]
+                queryset = [index_db._db.fetch(id)]
             else:
-                def __get_nested_value(entry, attribute_path:str) -> any:
-                    """
-                    Retrieve the value of a nested attribute path in the entry.
-
-                    This method now handles nested class attributes and avoids repeated class lookups
-                    by utilizing the attribute index.
-                    """
-                    parts = attribute_path.split('.')
-                    # Use a reduce to iterate over the attribute parts
-                    def lookup_value(accumulated_value, part):
-                        if isinstance(accumulated_value, dict):
-                            # If it's a dict, look up the value by key
-                            return accumulated_value.get(part, None)
-                        elif hasattr(accumulated_value, part):
-                            # If it's an object, use getattr to get the attribute
-                            return getattr(accumulated_value, part, None)
-                        else:
-                            
-                            return None
-                    # Initial value is the entry object itself (which may be a dictionary or class instance)
-                    return reduce(lookup_value, parts, entry)
-
-                def __condition_matches(entry, condition):
-                    attribute, operator, expected = condition
-                    actual_attribute = __get_nested_value(entry, attribute)
-                    actual_value = actual_attribute._value if hasattr(actual_attribute, '_value') else actual_attribute
-                    if operator == '==':
-                        return actual_value == expected
-                    elif operator == '<':
-                        return actual_value is not None and actual_value < expected
-                    elif operator == '>':
-                        return actual_value is not None and actual_value > expected
-                    elif operator == '<=':
-                        return actual_value is not None and actual_value <= expected
-                    elif operator == '>=':
-                        return actual_value is not None and actual_value >= expected
-                    elif operator == '∋':
-                        # Check if the value is in the list
-                        return expected in actual_value if isinstance(actual_value, list) else False
-                    else:
-                        raise ValueError(f'Unsupported operator {operator}')
-                    
                 self._block_executed_query()
 
                 # Try to use indexed lookups for equality conditions
                 candidate_ids = None
                 remaining_conditions = []
                 model_name = self.model.__name__
+                indexed_names = self.model._indexed_names
                 
                 for condition in self._conditions:
+                    # An empty intersection already decides the query, no further lookups or filters needed
+                    if candidate_ids is not None and not candidate_ids:
+                        break
                     attribute, operator, expected = condition
                     
-                    # Only use index for simple equality on non-nested attributes
-                    if operator == '==' and '.' not in attribute:
-                        indexed_ids = self._hsdb_reference.index_db.lookup_by_field(
-                            model_name, attribute, expected
-                        )
-                        if indexed_ids:
-                            if candidate_ids is None:
-                                candidate_ids = indexed_ids
-                            else:
-                                # Intersection for multiple indexed conditions
-                                candidate_ids = candidate_ids & indexed_ids
+                    # Only use index for simple equality on attributes the model keeps a field index for,
+                    # an empty lookup then means there are no matches at all instead of a missing index
+                    if operator == '==' and (attribute in indexed_names or attribute == 'id'):
+                        if attribute == 'id':
+                            # The id keys the primary index, it has no field index of its own
+                            indexed_ids = {str(expected)} if str(expected) in index_db._db else set()
+                        else:
+                            indexed_ids = index_db.lookup_by_field(
+                                model_name, attribute, expected
+                            )
+                        if candidate_ids is None:
+                            candidate_ids = indexed_ids
                         else:
-                            # No index for this field, check later
-                            remaining_conditions.append(condition)
+                            # Intersection for multiple indexed conditions
+                            candidate_ids = candidate_ids & indexed_ids
                     else:
+                        # No index for this field, check later
                         remaining_conditions.append(condition)
                 
                 # If no indexed conditions matched, use model index to get all entries of this model
                 if candidate_ids is None:
-                    candidate_ids = self._hsdb_reference.index_db.lookup_by_model(model_name)
+                    candidate_ids = index_db.lookup_by_model(model_name)
                 
-                # Use subset if provided
+                # Use subset if provided, intersection() takes the id list as is instead of copying it
+                # into a temporary set first and iterates the smaller side when given a set
                 if self.subset:
-                    candidate_ids = candidate_ids & set(self.subset)
+                    candidate_ids = candidate_ids.intersection(self.subset)
+                
+                # Candidates are resolved straight from the primary index dict instead of a locked fetch() per id
+                entries = index_db._db.primary_index
+                queryset = None
+                
+                # Without a sort key first() and last() only need the first match from either end of the candidates,
+                # so the scan stops there instead of filtering the whole candidate set
+                single_match = not self._sort_key and self._pagination in ((0, 1), (-1, 1))
+                scanned_ids = candidate_ids
+                if single_match and self._pagination[0] < 0:
+                    scanned_ids = reversed(list(candidate_ids))
+                
+                # Large candidate sets filtered only by numeric comparisons are evaluated column-wise
+                if not single_match and remaining_conditions and len(candidate_ids) >= _VECTORIZE_THRESHOLD \
+                   and self._vectorizable(remaining_conditions):
+                    resolved_ids, resolved_entries = [], []
+                    for entry_id in candidate_ids:
+                        entry = entries.get(entry_id)
+                        if entry is not None and entry.model is self.model:
+                            resolved_ids.append(entry_id)
+                            resolved_entries.append(entry)
+                    mask = self._columnar_mask(resolved_entries, remaining_conditions)
+                    if mask is not None:
+                        resolved = resolved_ids if self._return_ids else resolved_entries
+                        queryset = [resolved[index] for index in mask.nonzero()[0]]
                 
-                # Filter using remaining non-indexed conditions
-                queryset = []
-                for entry_id in candidate_ids:
-                    try:
-                        entry = self._hsdb_reference.index_db._db.fetch(entry_id)
-                        
-                        # Verify model type (safety check)
-                        if entry.model != self.model:
+                if queryset is None:
+                    # Filter using remaining non-indexed conditions, compiled once for the whole candidate set
+                    matches = self._compile_predicate(remaining_conditions)
+                    queryset = []
+                    for entry_id in scanned_ids:
+                        entry = entries.get(entry_id)
+                        # Entry was deleted or does not belong to this model (safety check)
+                        if entry is None or entry.model is not self.model:
                             continue
                             
                         # Check remaining conditions
-                        if all(__condition_matches(entry, condition) for condition in remaining_conditions):
+                        if matches(entry):
                             if self._return_ids:
                                 queryset.append(entry_id)
                             else:
                                 queryset.append(entry)
-                    except KeyError:
-                        # Entry was deleted
-                        continue
+                            if single_match:
+                                break
 
                 # TODO: Add support for nested values in sorting and filtering
                 # Sort the queryset if needed.
                 if self._sort_key:
-                    def get_sort_value(entry):
-                        val = getattr(entry, self._sort_key, None)
-                        return val._value if hasattr(val, '_value') else val
-                    queryset.sort(key=get_sort_value, reverse=self._sort_order == 'desc')
+                    queryset = self._sort_queryset(queryset)
                     
                 if self._filter_key:
                     queryset = [getattr(entry, self._filter_key) for entry in queryset]
@@ -29,6 +29,13 @@ _AVAILABLE_FIELDS = [
     'reverse_lookup',
     'secondary_model'
 ]
+# Reverse relation type and whether the default reverse lookup key is pluralized, per relation type
+_RELATION_TYPES = {
+    'many-to-many': ('many-to-many', True),
+    'many-to-one': ('one-to-many', True),
+    'one-to-many': ('one-to-many', False),
+    'one-to-one': ('one-to-one', False)
+}
 _SUPPORTED_TYPES = [str, List[str]]
 # Type alias for attribute types
 T = TypeVar('T')
@@ -45,6 +52,8 @@ class HSDBRelation(HSDBField, Generic[T]):
     for interacting with the relational index of the IndexDatabase singleton instance.
     """
     _hsdb_reference:object # HybridStorage, avoiding import loop
+    _name_cache:dict = {} # Stitched relation names by (primary model, secondary model, relation type)
+    _reverse_lookup_cache:dict = {} # Default reverse lookup keys by (primary model, pluralize)
     primary_model:type
     relation_id:str
     relation_name:type
@@ -93,20 +102,23 @@ class HSDBRelation(HSDBField, Generic[T]):
         self.type = type # This sets the actual type based on the generic argument
         
         self.relation_name = self._stitch_relation_name(primary_model, secondary_model, relation_type)
-        reverse_relation_type = relation_type
-        if relation_type == 'many-to-one':
-            reverse_relation_type = 'one-to-many'
+        reverse_relation_type, pluralize = _RELATION_TYPES.get(relation_type, (relation_type, False))
         self.reverse_relation_name = self._stitch_relation_name(secondary_model, primary_model, reverse_relation_type)
         if reverse_lookup is not None:
             self.reverse_lookup = reverse_lookup
         else:
-            reverse_lookup_key = kebabify(primary_model.__name__, replace=('-model', ''))
-            if relation_type == 'many-to-one' or relation_type == 'many-to-many':
-                reverse_lookup_key = f'{reverse_lookup_key}s'
+            # The default key only depends on the primary model and the plurality, so it is derived once per pair
+            cache_key = (primary_model, pluralize)
+            reverse_lookup_key = self._reverse_lookup_cache.get(cache_key)
+            if reverse_lookup_key is None:
+                reverse_lookup_key = kebabify(primary_model.__name__, replace=('-model', ''))
+                if pluralize:
+                    reverse_lookup_key = f'{reverse_lookup_key}s'
+                self._reverse_lookup_cache[cache_key] = reverse_lookup_key
             self.reverse_lookup = reverse_lookup_key
         
         self.relation_id = generate_id()
-        self._hsdb_reference = HybridStorage()
+        self._hsdb_reference = HybridStorage.instance() # Cached singleton reference, skipping the SingletonMeta lock
         
         self.addKeyPairs(primary_keys, secondary_keys)
     
@@ -118,7 +130,13 @@ class HSDBRelation(HSDBField, Generic[T]):
     
     @classmethod
     def _stitch_relation_name(cls, primary_model, secondary_model, relation_type):
-        return f'{primary_model.__name__}_{relation_type}_{secondary_model.__name__}'
+        # Every relation instance between the same models stitches the same names, so each is formatted once
+        cache_key = (primary_model, secondary_model, relation_type)
+        relation_name = cls._name_cache.get(cache_key)
+        if relation_name is None:
+            relation_name = f'{primary_model.__name__}_{relation_type}_{secondary_model.__name__}'
+            cls._name_cache[cache_key] = relation_name
+        return relation_name
             
     def _validate_key(self, key:HSDBField) -> None:
         if not isinstance(key, HSDBField) or not key:
@@ -127,8 +145,9 @@ class HSDBRelation(HSDBField, Generic[T]):
     def _validate_keys(self, keys:List[HSDBField]) -> None:
         if not isinstance(keys, list) or not keys:
             raise ValueError('keys must be a HSDBField list')
-        for key in keys:
-            self._validate_key(key)
+        # Checking all keys in one short-circuiting pass instead of a _validate_key call per key
+        if not all(isinstance(key, HSDBField) and key for key in keys):
+            raise ValueError('key must be a HSDBField')
             
     def addKeyPairs(self,
                     primary_keys:List[HSDBField],
@@ -199,6 +218,9 @@ class HSDBRelation(HSDBField, Generic[T]):
         #########################################################################
     
     class _RelationFactory(ABC, Generic[T]):
+        # Factories are plain value holders, the relation type is read from the subclass' class attribute
+        __slots__ = ('editable', 'relation_key', 'relation_type', 'required', 'reverse_lookup', 'secondary_model')
+        
         editable:bool
         relation_key:str
         relation_type:str
@@ -218,7 +240,6 @@ class HSDBRelation(HSDBField, Generic[T]):
             self.required = required
             self.reverse_lookup = reverse_lookup
             self.secondary_model = secondary_model
-            self.type = self.__class__.type
             
             self.relation_type = kebabify(self.__class__.__name__)
             
@@ -243,6 +264,7 @@ class HSDBRelation(HSDBField, Generic[T]):
             return
     
     class OneToOne(_RelationFactory):
+        __slots__ = ()
         type=str
         
         def apply_ruleset(self, primary_keys:List[HSDBField], secondary_keys:List[HSDBField]) -> None:
@@ -250,6 +272,7 @@ class HSDBRelation(HSDBField, Generic[T]):
                 raise ValueError('One-To-One relation can only have one entry')
 
     class ManyToOne(_RelationFactory):
+        __slots__ = ()
         type=str
         
         def apply_ruleset(self, primary_keys:List[HSDBField], secondary_keys:List[HSDBField]) -> None:
@@ -257,4 +280,5 @@ class HSDBRelation(HSDBField, Generic[T]):
                 raise ValueError('Many-To-One relation can only have one primary key entry')
 
     class ManyToMany(_RelationFactory):
+        __slots__ = ()
         type=List[str]
\ No newline at end of file
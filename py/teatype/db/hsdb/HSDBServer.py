@@ -145,14 +145,13 @@ class HSDBServer():
         }
         """
         from django.http import JsonResponse
-        from teatype.toolkit import kebabify
         
         models_list = []
         
         for model in self.models:
             model_info = {
                 'name': model.__name__,
-                'resource': kebabify(model.__name__, remove='-model', plural=True),
+                'resource': model.resource_name_plural,
                 'count': model.count() if hasattr(model, 'count') else 0
             }
             models_list.append(model_info)
@@ -196,13 +195,12 @@ class HSDBServer():
         }
         """
         from django.http import JsonResponse
-        from teatype.toolkit import kebabify
         from datetime import datetime, timezone
         
         apis = []
         
         for model in self.models:
-            resource_name = kebabify(model.__name__, remove='-model', plural=True)
+            resource_name = model.resource_name_plural # Computed once per class by HSDBMeta
             
             # Build field schema
             fields = {}
@@ -12,8 +12,7 @@
 
 # Standard-library imports
 import threading
-import traceback
-from multiprocessing import Queue
+from queue import SimpleQueue
 from typing import List, Tuple
 
 # Third-party imports
@@ -33,12 +32,13 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
     combining them to synchronize model entries with file storage in a 
     threaded environment. The SingletonMeta ensures only one instance exists.
     """
+    _instance:'HybridStorage' = None # Direct reference to the singleton, set once initialized
     coroutines:List
-    coroutines_queue:Queue
+    coroutines_queue:SimpleQueue
     fixtures:dict
     index_db:IndexDatabase
     migrations:dict
-    operations_queue:Queue
+    operations_queue:SimpleQueue
     rf_handler:RawFileHandler
 
     # TODO: Put this outside of class context so the first import HybridStorage initializes it
@@ -61,10 +61,10 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
                 root_path = env.get('HSDB_ROOT_PATH') # Retrieves path from environment
 
             self.coroutines = [] # List to keep track of coroutines
-            self.coroutines_queue = Queue() # Queue for coroutine scheduling
+            self.coroutines_queue = SimpleQueue() # Queue for coroutine scheduling
             self.fixtures = dict # Will store fixture-related data
             self.migrations = dict # Placeholder for storing migration info
-            self.operations_queue = Queue() # Queue for operations processing
+            self.operations_queue = SimpleQueue() # Queue for operations processing
 
             self.index_db = IndexDatabase(models) # Create or link an IndexDatabase with given models
             
@@ -73,7 +73,7 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
             self._initialized = True # Mark as initialized
             HybridStorage._instance = self # Set the instance for Singleton
             
-            success(f'HybridStorage finished initialization') # sucess the initialization
+            success('HybridStorage finished initialization') # sucess the initialization
             println()
     
     @classmethod
@@ -81,9 +81,18 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
         """
         Return or create the HybridStorage singleton instance.
         """
-        if not hasattr(cls, '_instance'):
-            cls._instance = HybridStorage() # Create a default instance if none exists
-        return cls._instance
+        # Plain attribute check, no SingletonMeta lock and no AttributeError on the first call
+        instance = cls._instance
+        if instance is None:
+            instance = cls._instance = HybridStorage() # Create a default instance if none exists
+        return instance
+    
+    def _models_by_name(self) -> dict:
+        """
+        Map the registered model names to their classes for O(1) lookups.
+        Built per call, so models appended to the IndexDatabase later are picked up.
+        """
+        return {model.__name__: model for model in self.index_db.models}
     
     # def fill(self):
     #     pass
@@ -96,54 +105,52 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
         Load and install fixtures from a specified path into the index database.
         """
         # TODO: Get default path if fixtures_path is None
-        fixtures:List[dict] = parse_fixtures(fixtures_path=fixtures_path) # Parse fixtures from file(s)
-        for fixture in fixtures:
+        models_by_name = self._models_by_name() # Resolved once instead of scanning the models per fixture
+        create_entry = self.create_entry # Bound once, the loop below runs per fixture entry
+        # Fixtures are parsed lazily file by file, each one is installed before the next file is read
+        for fixture in parse_fixtures(fixtures_path=fixtures_path):
             model_name = fixture.get('model')  # Extract model name from fixture
-            matched_model = next((cls for cls in self.index_db.models if cls.__name__ == model_name), None)
+            matched_model = models_by_name.get(model_name)
             if matched_model is None:
                 raise ValueError(f'Model {model_name} not found in models') # Ensure the matching model is present
 
             # Loop through each entry in fixture
             for entry in fixture.get('fixtures'):
                 data = entry.get('data') # Retrieve the data portion of the fixture
-                # Check which localized name to use
-                if 'de_DE' in data.get('name'):
-                    name = data['name']['de_DE']
-                elif 'en_EN' in data.get('name'):
-                    name = data['name']['en_EN']
-                else:
-                    name = data.get('name')
-                data.update({'name': name}) # Update the data dict to unify 'name'
-                try:
-                    del data['name']['de_DE']
-                    del data['name']['en_EN']
-                    # del data['model_data']
-                except:
-                    pass # It's okay if these keys don't exist
+                # Check which localized name to use, only localized names come as a dict
+                name = data.get('name')
+                if isinstance(name, dict):
+                    name = name['de_DE'] if 'de_DE' in name else name.get('en_EN', name)
+                data['name'] = name # Update the data dict to unify 'name'
 
                 # Create a new entry in the index database, parse it if needed and write it
-                self.create_entry(matched_model, entry, parse=True, write=True)
+                create_entry(matched_model, entry, parse=True, write=True)
                 
     def install_index_files(self) -> None:
         """
         Read index files, parse them, and create entries for them in the database if not already present.
         """
         parsed_index_files:List[dict] = parse_index_files(hybrid_storage_instance=self) # Parse index files
-        for index_key in parsed_index_files:
+        models_by_name = self._models_by_name() # Resolved once instead of scanning the models per index key
+        # Existence is checked against the entry dict directly instead of a locked fetch per index file,
+        # entries created below land in the same dict and are seen by later checks
+        existing_entries = self.index_db._db.primary_index
+        create_entry = self.create_entry # Bound once, the loop below runs per index file
+        for index_files in parsed_index_files.values():
             # Retrieve the model_name from the data
-            model_name = parsed_index_files[index_key][0].get('model_data').get('model_name')
-            matched_model = next((cls for cls in self.index_db.models if cls.__name__ == model_name), None)
+            model_name = index_files[0].get('model_data').get('model_name')
+            matched_model = models_by_name.get(model_name)
             if matched_model is None:
                 raise ValueError(f'Model {model_name} not found in models') # Ensure the model is present
 
             # For each file, check if an entry already exists; if not, create it
-            for index_file in parsed_index_files[index_key]:
+            for index_file in index_files:
                 id = index_file.get('base_data').get('id') # Identify the unique ID
-                if self.fetch_entry(id):
+                if str(id) in existing_entries:
                     continue # Skip creation if it already exists in the database
                 
                 # Create a new entry for the index file, do not write if parse is enough
-                self.create_entry(matched_model, index_file, parse=True, write=False)
+                create_entry(matched_model, index_file, parse=True, write=False)
 
     def create_entry(self,
                      model:object,
@@ -155,6 +162,9 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
         Create a new entry for a given model, optionally parsing the 
         entry data and writing it to the file system.
         """
+        # Cold mode never touches the disk, so the write path is skipped up front instead of
+        # writing nothing and then probing the file system for the file
+        write = write and not self.rf_handler.cold_mode
         try:
             # TODO: Implement implemented trap cleanup handlers in models
             # The index database is asked to create an entry from data
@@ -162,24 +172,24 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
             if model_instance is None: # If for some reason creation fails
                 return None, return_code
             
-            if write: # If writing to disk is enabled
+            if write and return_code == 200: # If writing to disk is enabled
                 try:
-                    if return_code == 200:
-                        file_path = self.rf_handler.create_entry(model_instance, overwrite_path)
-                        # If the file does not exist after creation, rollback the index entry
-                        if not file.exists(file_path):
-                            model_instance.delete()
-                            return None, 410 # Indicate that writing failed
-                except:
+                    file_path = self.rf_handler.create_entry(model_instance, overwrite_path)
+                    # If the file handler failed or the file does not exist after creation, rollback the index entry
+                    if file_path is None or not file.exists(file_path):
+                        model_instance.delete()
+                        return None, 410 # Indicate that writing failed
+                except OSError:
                     err('HybridStorage.create_entry() encountered an exception during file writing.', traceback=True)
                     model_instance.delete()
                     # self.rf_handler.delete_entry(model_instance, overwrite_path)
                     return None, 410 # Indicate internal server error
-            return model_instance.serialize(), return_code # Return the serialized model instance
-        except:
+            # Return the serialized model instance, built from the serializer output cached on the instance
+            return model_instance.model.serialize(model_instance), return_code
+        except (ValueError, TypeError, AttributeError):
             # TODO: Implement global RUNTIME_CONFIG that is accessible everywhere for all modules and is modified by service modulos
             # if RUNTIME_CONFIG.DEBUG_MODE:
-            traceback.print_exc()
+            # err() already prints the traceback, other exceptions are programming errors and propagate
             err('HybridStorage.create_entry() encountered an exception during entry creation.', traceback=True)
             return None, 500 # Indicate internal server error
 
@@ -245,7 +255,7 @@ class HybridStorage(threading.Thread, metaclass=SingletonMeta):
             
         Returns:
             Tuple of (updated_entry, return_code)
-            Return codes: 200=success, 404=not found, 500=error
+            Return codes: 200=success, 404=not found, 409=unique conflict, 500=error
         """
         try:
             entry, return_code = self.index_db.update_entry(entry_id, data)
@@ -11,18 +11,22 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
-import json
-from typing import Dict, List, Set
+import sys
+import threading
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set, Tuple
 
 # Third-party imports
-from pympler import asizeof
 from teatype.enum import XTerm
 from teatype.db.hsdb.indices import FieldsIndex, Index, ModelIndex, RelationalIndex
 from teatype.logging import *
 
+# Strips the JSON punctuation from the pretty-printed entries in one pass
+_JSON_PUNCTUATION = str.maketrans('', '', '{}",')
+
 class _MemoryFootprint:
-    def __init__(self, index_db:'IndexDatabase'):
-        self.size_in_bytes = asizeof.asizeof(index_db)
+    def __init__(self, size_in_bytes:int):
+        self.size_in_bytes = size_in_bytes
         self.size_in_kilo_bytes = round(self.size_in_bytes / 1024, 2)
         self.size_in_mega_bytes = round(self.size_in_kilo_bytes / 1024, 2)
         
@@ -35,16 +39,24 @@ class _MemoryFootprint:
         return self.__repr__()
         
 class IndexDatabase:
+    _accounting_lock:threading.Lock # Guards the size accounting, which is shared by the inserts of all models
     _db:Index # For all raw data
     _indexed_fields:FieldsIndex # For all indexed fields for faster query lookups
     _model_index:ModelIndex # For all model references for faster model query lookups
+    _model_locks:Dict[str, threading.Lock] # Serialises the check-then-insert of entries per model, unrelated models never contend
     _relational_index:RelationalIndex # For all relations between models parsed dynamically from the model definitions
+    _entry_sizes:Dict[str, int] # Accounted size of every entry, subtracted again when it leaves
+    _total_bytes:int # Running size of all entries, kept up to date on every mutation
     models:List[type] # For all models
     
     def __init__(self,
                  models:List[type]):
         self.models = models
         
+        self._accounting_lock = threading.Lock()
+        self._entry_sizes = dict()
+        self._total_bytes = 0
+        
         self._db = Index(cache_entries=False, 
                          primary_index_key='id',
                          max_size=None)
@@ -60,6 +72,9 @@ class IndexDatabase:
         # Pre-register models in the model index
         self._model_index.register_models(models)
         
+        # Locks of unregistered models are created on first use
+        self._model_locks = defaultdict(threading.Lock, {model.__name__: threading.Lock() for model in models})
+        
     ##############
     # Properties #
     ##############
@@ -67,7 +82,7 @@ class IndexDatabase:
     @property
     def memory_footprint(self) -> '_MemoryFootprint':
         # TODO: Replace with probe.memory()
-        return _MemoryFootprint(self)
+        return _MemoryFootprint(self._total_bytes)
     
     @property
     def size(self) -> int:
@@ -143,60 +158,128 @@ class IndexDatabase:
                 }
             
             # Create model instance
-            model_instance = model(data)
-            model_name = model_instance.model_name
-            model_id = str(model_instance.id)
+            return self._insert_entry(model(data))
+        except Exception as e:
+            err(f'Could not create index database entry: {e}', traceback=True)
+            return None, 500
+    
+    def _insert_entry(self, model_instance:object) -> Tuple[object, int]:
+        """
+        Insert a model instance into all indices, the shared insert path of create_entry and HSDBModel.save.
+        Returns the conflicting entry and 409 if the id or a unique value is taken, raises if indexing fails.
+        """
+        model_name = model_instance.model_name
+        model_id = str(model_instance.id)
+        
+        # Check if entry already exists
+        if model_id in self._db:
+            return self._db.fetch(model_id), 409
+        
+        # Only inserts of the same model have to agree on their unique values,
+        # the indices themselves are guarded by their own transaction locks
+        with self._model_locks[model_name]:
+            # Check unique attributes against the field index, one hash probe per attribute instead of scanning the entries
+            conflicting_entry = self._find_unique_conflict(model_instance)
+            if conflicting_entry is not None:
+                return conflicting_entry, 409
             
-            # Check if entry already exists
-            if model_id in self._db:
-                return self._db.fetch(model_id), 409
+            # The indexed values are read before the entry is added, a failing read leaves nothing behind
+            indexed_values = self._indexed_values(model_instance)
             
             # Add to primary index
             self._db.add(model_id, model_instance)
             
-            # Add to model index for O(1) model lookups
-            self._add_to_model_index(model_name, model_id)
-            
-            # Add indexed fields to field index
-            self._index_entry_fields(model_instance)
-            
-            return model_instance, 200
-        except Exception as e:
-            err(f'Could not create index database entry: {e}', traceback=True)
-            return None, 500
+            # Add indexed fields to field index, a failed insert is rolled back out of the primary index
+            try:
+                self._index_entry_fields(model_instance, indexed_values, strict=True)
+            except:
+                self._unindex_entry_fields(model_instance, indexed_values)
+                self._db.remove(model_id)
+                raise
+        
+        # The model index is derived data, maintained outside the critical section
+        self._add_to_model_index(model_name, model_id)
+        self._account_entry(model_id, model_instance)
+        return model_instance, 200
     
-    def _index_entry_fields(self, entry:object) -> None:
-        """Index all indexed fields for an entry."""
-        from teatype.db.hsdb import HSDBAttribute
+    def _account_entry(self, entry_id:str, entry:object) -> None:
+        """Replace the accounted size of an entry in the running total."""
+        # Shallow sizes of the instance, its id, its field list and the field values,
+        # a constant amount of work per entry instead of a deep walk over the whole database
+        size = sys.getsizeof(entry) + sys.getsizeof(entry_id)
+        fields = getattr(entry, '_fields', None)
+        if fields is not None:
+            size += sys.getsizeof(fields)
+            for field in fields:
+                if field is not None:
+                    size += sys.getsizeof(field._value)
+        # The model locks don't cover this, concurrent inserts of different models share the running total
+        with self._accounting_lock:
+            self._total_bytes += size - self._entry_sizes.get(entry_id, 0)
+            self._entry_sizes[entry_id] = size
+    
+    def _find_unique_conflict(self, entry:object, values:dict=None) -> object|None:
+        """
+        Return another entry that already holds one of the entry's unique attribute values.
+        With values, the given new attribute values are checked instead of the entry's current ones.
+        """
         model_name = entry.model_name
+        entry_id = str(entry.id)
+        fields = entry._fields
+        for attr_name in entry._unique_names:
+            if values is None:
+                field = fields[entry._field_index[attr_name]]
+                value = None if field is None else field._value
+            else:
+                value = values.get(attr_name)
+            if value is None:
+                continue # Unset values can't conflict
+            # The entry itself holds its own values, it never conflicts with itself on an update
+            for conflicting_id in self.lookup_by_field(model_name, attr_name, value):
+                if conflicting_id != entry_id:
+                    return self._db.fetch(conflicting_id)
+        return None
+    
+    def _index_entry_fields(self, entry:object, indexed_values:List[tuple]=None, strict:bool=False) -> None:
+        """
+        Index all indexed fields for an entry.
+        With strict, a failing field index insert is raised instead of skipped, so the caller can roll back.
+        """
+        model_name = entry.model_name
+        entry_id = str(entry.id)
         
-        # Get cached attributes for this model
-        if entry.__class__ in entry._attribute_cache:
-            for attr_name, attr in entry._attribute_cache[entry.__class__].items():
-                if isinstance(attr, HSDBAttribute) and attr.indexed:
-                    try:
-                        value = getattr(entry, attr_name)
-                        if hasattr(value, '_value'):
-                            value = value._value
-                        self._add_to_field_index(model_name, attr_name, value, str(entry.id))
-                    except:
-                        pass
+        # The model class keeps the slots of its indexed (and unique) attributes
+        for attr_name, value in self._indexed_values(entry) if indexed_values is None else indexed_values:
+            try:
+                self._add_to_field_index(model_name, attr_name, value, entry_id)
+            except:
+                if strict:
+                    raise
     
-    def _unindex_entry_fields(self, entry:object) -> None:
+    def _unindex_entry_fields(self, entry:object, indexed_values:List[tuple]=None) -> None:
         """Remove all indexed fields for an entry from indices."""
-        from teatype.db.hsdb import HSDBAttribute
         model_name = entry.model_name
+        entry_id = str(entry.id)
         
-        if entry.__class__ in entry._attribute_cache:
-            for attr_name, attr in entry._attribute_cache[entry.__class__].items():
-                if isinstance(attr, HSDBAttribute) and attr.indexed:
-                    try:
-                        value = getattr(entry, attr_name)
-                        if hasattr(value, '_value'):
-                            value = value._value
-                        self._remove_from_field_index(model_name, attr_name, value, str(entry.id))
-                    except:
-                        pass
+        for attr_name, value in self._indexed_values(entry) if indexed_values is None else indexed_values:
+            try:
+                self._remove_from_field_index(model_name, attr_name, value, entry_id)
+            except:
+                pass
+    
+    @staticmethod
+    def _indexed_values(entry:object) -> List[tuple]:
+        """Read the (name, value) pairs of an entry's indexed attributes straight from its field slots."""
+        fields = entry._fields
+        pairs = []
+        for attr_name, slot in entry._indexed_slots:
+            field = fields[slot]
+            if field is None:
+                continue # Optional attributes left unset have no field and nothing to index
+            # A built wrapper holds the live value, otherwise the field itself does
+            wrapper = field._wrapper
+            pairs.append((attr_name, field._value if wrapper is None else wrapper._value))
+        return pairs
     
     def update_entry(self, entry_id:str, data:dict) -> object|None:
         """
@@ -205,6 +288,7 @@ class IndexDatabase:
         Return codes:
             - 200: Success
             - 404: Not Found
+            - 409: Conflict (A unique value is already taken by another entry)
             - 500: Internal Server Error
         """
         try:
@@ -214,15 +298,22 @@ class IndexDatabase:
             
             entry = self._db.fetch(entry_id)
             
-            # Remove old indexed field values
-            self._unindex_entry_fields(entry)
-            
-            # Update the entry
-            entry.update(data)
-            
-            # Re-index with new values
-            self._index_entry_fields(entry)
+            # The unique check and the re-indexing are serialised with the inserts of the same model
+            with self._model_locks[entry.model_name]:
+                conflicting_entry = self._find_unique_conflict(entry, data)
+                if conflicting_entry is not None:
+                    return conflicting_entry, 409
+                
+                # Remove old indexed field values
+                self._unindex_entry_fields(entry)
+                
+                # Update the entry
+                entry.update(data)
+                
+                # Re-index with new values
+                self._index_entry_fields(entry)
             
+            self._account_entry(entry_id, entry)
             return entry, 200
         except Exception as e:
             err(f'Could not update index database entry: {e}', traceback=True)
@@ -254,6 +345,8 @@ class IndexDatabase:
             # Remove from primary index
             self._db.remove(entry_id)
             
+            with self._accounting_lock:
+                self._total_bytes -= self._entry_sizes.pop(entry_id, 0)
             return True, 200
         except Exception as e:
             err(f'Could not delete index database entry: {e}', traceback=True)
@@ -268,15 +361,28 @@ class IndexDatabase:
             include_relations: Whether to include relation IDs in serialization
             expand_relations: Whether to expand relations to full objects (implies include_relations)
         """
-        entries = []
-        for entry_id in self._db:
-            entry = self._db.fetch(entry_id)
+        if not serialize:
+            return list(self._db.primary_index.values())
+        return list(self.iter_all(serialize=serialize,
+                                  include_relations=include_relations,
+                                  expand_relations=expand_relations))
+    
+    def iter_all(self, serialize:bool=False, include_relations:bool=False, expand_relations:bool=False) -> Iterator[object]:
+        """
+        Stream all entries from the database, serializing them one at a time.
+        
+        Args:
+            serialize: Whether to serialize entries to dicts
+            include_relations: Whether to include relation IDs in serialization
+            expand_relations: Whether to expand relations to full objects (implies include_relations)
+        """
+        # Snapshot the entry references once (a C-level copy), the serialization then runs lazily
+        for entry in list(self._db.primary_index.values()):
             if serialize:
-                entry = entry.model.serialize(entry, 
+                entry = entry.model.serialize(entry,
                                               include_relations=include_relations,
                                               expand_relations=expand_relations)
-            entries.append(entry)
-        return entries
+            yield entry
         
     def fetch_model_entries(self, model:type, serialize:bool=False, 
                            include_relations:bool=False, expand_relations:bool=False) -> List[object]:
@@ -293,19 +399,23 @@ class IndexDatabase:
         entries = []
         model_name = model.__name__
         
-        # Use model index for fast lookup
+        # Use model index for fast lookup and read the matching rows straight out of the
+        # primary index, so only same-model entries are ever touched
         entry_ids = self.lookup_by_model(model_name)
+        fetch_row = self._db.primary_index.get
         for entry_id in entry_ids:
-            try:
-                entry = self._db.fetch(entry_id)
-                if serialize:
-                    entry = entry.model.serialize(entry,
-                                                  include_relations=include_relations,
-                                                  expand_relations=expand_relations)
-                entries.append(entry)
-            except KeyError:
+            entry = fetch_row(entry_id)
+            if entry is None:
                 # Entry was deleted, remove from model index
                 self._remove_from_model_index(model_name, entry_id)
+                continue
+            entries.append(entry)
+        
+        if serialize:
+            # All entries share the model, so its serializer is bound once for the whole list
+            serialize_entry = model.serialize
+            return [serialize_entry(entry, include_relations=include_relations, expand_relations=expand_relations)
+                    for entry in entries]
         return entries
     
     def fetch_entry(self, id, serialize:bool=False, 
@@ -330,29 +440,29 @@ class IndexDatabase:
         """
         Print the database.
         """
-        counter = 0
+        # Snapshot the entries once (a C-level copy), so printing never iterates the live index
+        entries = list(self._db.primary_index.values())
+        if limit > 0:
+            entries = entries[:limit]
         println()
         print('########################')
         print('Index database raw data:')
         print('------------------------')
-        for entry in self._db:
+        for entry in entries:
             println()
-            json_entry = json.dumps(entry.model.serialize(entry), indent=4)
-            print(f'{XTerm.GREEN}{entry.id} {XTerm.GRAY}[{entry.id.key}]{XTerm.RESET}:')
-            string_entry = str(json_entry).replace('{', '').replace('}', '').replace('"', '').replace(',', '').strip()
+            json_entry = entry.model.serialize(entry, json_dump=True)
+            string_entry = json_entry.translate(_JSON_PUNCTUATION).strip()
             string_entries = string_entry.split('\n')
             
-            print(f'    {XTerm.RED}model: {XTerm.LIGHT_RED}{entry.model_name}{XTerm.RESET}')
+            # The entry block is formatted first and written with a single print call
+            lines = [f'{XTerm.GREEN}{entry.id} {XTerm.GRAY}[{entry.id.key}]{XTerm.RESET}:',
+                     f'    {XTerm.RED}model: {XTerm.LIGHT_RED}{entry.model_name}{XTerm.RESET}']
             for sub_string_entry in string_entries:
                 sub_string_entries = sub_string_entry.strip().split(':')
                 if sub_string_entries[0] == 'id':
                     continue
-                print(f'    {XTerm.BLUE}{sub_string_entries[0]}: {XTerm.LIGHT_CYAN}{sub_string_entries[1]}{XTerm.RESET}')
-            
-            if limit > 0:
-                counter += 1
-                if counter == limit:
-                    break
+                lines.append(f'    {XTerm.BLUE}{sub_string_entries[0]}: {XTerm.LIGHT_CYAN}{sub_string_entries[1]}{XTerm.RESET}')
+            print('\n'.join(lines))
         
         if limit > 0 and self.size > limit:
             println()
@@ -367,18 +477,21 @@ class IndexDatabase:
         Also updates model and field indices.
         Only for internal and testing use, skips validation.
         """
-        for entry_id, entry in id_data_pair.items():
-            entry_id = str(entry_id)
-            is_new = entry_id not in self._db
-            
-            if not is_new:
-                # Remove old indices before update
-                old_entry = self._db.fetch(entry_id)
+        id_data_pair = {str(entry_id): entry for entry_id, entry in id_data_pair.items()}
+        
+        # Remove old indices of replaced entries before update
+        existing_entries = self._db.primary_index
+        for entry_id in id_data_pair:
+            old_entry = existing_entries.get(entry_id)
+            if old_entry is not None:
                 self._unindex_entry_fields(old_entry)
-            
-            self._db.update({entry_id: entry})
-            
-            # Update indices
+        
+        # All entries land in the primary index with one locked update
+        self._db.update(id_data_pair)
+        
+        # Update indices
+        for entry_id, entry in id_data_pair.items():
             if hasattr(entry, 'model_name'):
                 self._add_to_model_index(entry.model_name, entry_id)
-                self._index_entry_fields(entry)
\ No newline at end of file
+                self._index_entry_fields(entry)
+            self._account_entry(entry_id, entry)
\ No newline at end of file
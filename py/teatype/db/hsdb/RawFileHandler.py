@@ -45,7 +45,7 @@ class RawFileHandler:
                      model_instance:object,
                      compress:bool=False) -> str|None:
         try:
-            absolute_path = path.join(self.fs.index.path, model_instance.path)
+            absolute_path = path.join(self._rf_structure.path_of('index'), model_instance.path)
 
             if self.cold_mode:
                 return absolute_path
@@ -72,7 +72,7 @@ class RawFileHandler:
             if self.cold_mode:
                 return True
             
-            absolute_path = path.join(self.fs.index.path, model_instance.path)
+            absolute_path = path.join(self._rf_structure.path_of('index'), model_instance.path)
             if not path.exists(absolute_path):
                 return False
             
@@ -86,7 +86,7 @@ class RawFileHandler:
                      model_instance:object,
                      compress:bool=False) -> str:
         try:
-            absolute_path = path.join(self.fs.index.path, model_instance.path)
+            absolute_path = path.join(self._rf_structure.path_of('index'), model_instance.path)
             if self.cold_mode:
                 return absolute_path
             
@@ -11,14 +11,19 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
-import copy
+from types import MappingProxyType
 
 # Third-party imports
 from teatype.io import path
 from teatype.logging import *
 
 _DEFAULT_ROOT_PATH = '/var/lib'
-_FS = {
+
+def _read_only(struct:dict) -> MappingProxyType:
+    return MappingProxyType({key: _read_only(value) for key, value in struct.items()})
+
+# Read-only all the way down, so every structure can share it without copying
+_FS = _read_only({
     'audits': {},
     'backups': {
         'indexdb': {},
@@ -46,7 +51,19 @@ _FS = {
         'rawfiles': {}
     },
     'reports': {},
-}
+})
+
+def _leaf_paths(struct:MappingProxyType, prefix:str='') -> tuple:
+    leaf_paths = []
+    for key, value in struct.items():
+        if value:
+            leaf_paths.extend(_leaf_paths(value, f'{prefix}{key}/'))
+        else:
+            leaf_paths.append(f'{prefix}{key}')
+    return tuple(leaf_paths)
+
+# Creating the leaves with their parents covers every folder, one mkdir each and no existence checks
+_FS_LEAF_PATHS = _leaf_paths(_FS)
 
 class _FSProxy:
     _current_path:str
@@ -57,11 +74,12 @@ class _FSProxy:
         self._structure = structure
         self._root_path = root_path
         self._current_path = path.join(root_path, current_path) if current_path else root_path
+        # The folder tree is closed, so every child is resolved once here and served as a plain
+        # instance attribute, leaving __getattr__ to unknown names only
+        for name, sub_structure in structure.items():
+            setattr(self, name, _FSProxy(sub_structure, root_path, path.join(self._current_path, name)))
     
     def __getattr__(self, name):
-        if name in self._structure:
-            sub_structure = self._structure[name]
-            return _FSProxy(sub_structure, self._root_path, path.join(self._current_path, name))
         raise AttributeError(f'No such attribute: {name}')
     
     @property
@@ -77,6 +95,7 @@ class _FSProxy:
 
 class RawFileStructure:
     _fs:_FSProxy
+    _paths:dict # Absolute path of every folder of the structure, keyed by its dotted name ('backups.indexdb')
     _root_path:str
     
     def __init__(self,
@@ -87,6 +106,7 @@ class RawFileStructure:
         self._root_path = path.join(root_path if root_path else _DEFAULT_ROOT_PATH, 'hsdb')
         
         self._fs = _FSProxy(_FS, self._root_path)
+        self._paths = self._flatten_paths(self._root_path, _FS)
         
         if cold_mode:
             hint('Cold mode enabled: Skipping raw file structure initialization.',
@@ -108,15 +128,31 @@ class RawFileStructure:
                     use_prefix=False,
                     verbose=False)
             
-            self.create_fs(self._root_path, copy.deepcopy(_FS))
+            self.create_fs(self._root_path, _FS)
         
-    def create_fs(self, base_path:str, struct:dict):
-        for key, value in struct.items():
-            dir_path = path.join(base_path, key)
-            if not path.exists(dir_path):
-                path.create(dir_path)
-            if isinstance(value, dict):
-                self.create_fs(dir_path, value)
+    def create_fs(self, base_path:str, struct:MappingProxyType):
+        leaf_paths = _FS_LEAF_PATHS if struct is _FS else _leaf_paths(struct)
+        for leaf_path in leaf_paths:
+            path.create(base_path, leaf_path, create_parents=True, exists_ok=True)
         
     def get_fs(self):
-        return self._fs
\ No newline at end of file
+        return self._fs
+    
+    def path_of(self, key:str) -> str:
+        """
+        Resolve the absolute path of a folder by its dotted name with a single lookup.
+        """
+        try:
+            return self._paths[key]
+        except KeyError:
+            raise AttributeError(f'No such attribute: {key}') from None
+    
+    def _flatten_paths(self, base_path:str, struct:dict, prefix:str='') -> dict:
+        paths = {}
+        for key, value in struct.items():
+            dotted_key = f'{prefix}{key}'
+            dir_path = path.join(base_path, key)
+            paths[dotted_key] = dir_path
+            if value:
+                paths.update(self._flatten_paths(dir_path, value, f'{dotted_key}.'))
+        return paths
\ No newline at end of file
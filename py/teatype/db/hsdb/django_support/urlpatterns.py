@@ -13,49 +13,46 @@
 # Standard-library imports
 import importlib
 import pkgutil
-
-# Third-party imports
-from django.urls import path
-from rest_framework.urlpatterns import format_suffix_patterns
+import sys
 
 # Local imports
-from teatype.db.hsdb.django_support.views import HSDBDjangoCollection, HSDBDjangoResource, HSDBDjangoView
+from teatype.db.hsdb.django_support.views import HSDBDjangoCollection, HSDBDjangoView
 
 # TODO: Create a seperate base class without django support
 def parse_dynamic_routes(app_name:str, search_path:str, verbose:bool=False):
+    # Imported on first use, only the url configuration needs the routing helpers
+    from django.urls import path
+    from rest_framework.urlpatterns import format_suffix_patterns
+    
     print(f'Dynamic route registration for app "{app_name}"')
     urlpatterns = []
+    package = f'{app_name}.resources' # Resolved once, every route module is imported by its absolute name
+    loaded_modules = sys.modules
     for _, module_name, _ in pkgutil.iter_modules([search_path]):
-        module = importlib.import_module(f'{app_name}.resources.{module_name}')
+        full_name = f'{package}.{module_name}'
+        # Modules imported before (e.g. on url config reloads) are taken as is, only misses go through the import system
+        module = loaded_modules.get(full_name) or importlib.import_module(full_name)
         if verbose:
             print('Found module:', module_name)
-        for _, obj in vars(module).items():
-            if isinstance(obj, type) and issubclass(obj, HSDBDjangoView):
-                if verbose:
-                        print(f'Found class: {obj.__name__}, is subclass of HSDBDjangoView: {issubclass(obj, HSDBDjangoView)}')
-                        print(f'Is subclass of HSDBDjangoCollection: {issubclass(obj, HSDBDjangoCollection)}')
-
-        cls = next(
-            (
-                obj
-                for _, obj in vars(module).items()
-                if isinstance(obj, type) and issubclass(obj, HSDBDjangoView) and (obj is not HSDBDjangoCollection and obj is not HSDBDjangoResource)
-            ),
-            None
-        )
+        # The views register themselves when their module is imported, no namespace scan needed
+        views = HSDBDjangoView._registry.get(module.__name__, ())
+        if verbose:
+            for view in views:
+                print(f'Found class: {view.__name__}, is subclass of HSDBDjangoView: True')
+                print(f'Is subclass of HSDBDjangoCollection: {issubclass(view, HSDBDjangoCollection)}')
+        cls = views[0] if views else None
         if cls:
             if verbose:
                 print(f'Selected class: {cls.__name__}')
         else:
             raise Exception('No valid class selected!')
 
-        if issubclass(cls, HSDBDjangoView):
-            instance = cls()
-            api_name = instance.api_name()
-            api_path = instance.api_path()
-            view_type = 'collection' if cls.is_collection else 'resource'
-            
-            urlpatterns.append(path(api_path, cls.as_view(), name=api_name))
-            print(f'    Registered route: "{api_path}" for {view_type} "{api_name}"')
+        instance = cls()
+        api_name = instance.api_name()
+        api_path = instance.api_path()
+        view_type = 'collection' if cls.is_collection else 'resource'
+        
+        urlpatterns.append(path(api_path, cls.as_view(), name=api_name))
+        print(f'    Registered route: "{api_path}" for {view_type} "{api_name}"')
     print()
     return format_suffix_patterns(urlpatterns)
\ No newline at end of file
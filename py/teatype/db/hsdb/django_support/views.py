@@ -13,7 +13,7 @@
 # Standard-library imports
 import traceback
 from abc import ABCMeta
-from typing import List, Type
+from typing import Callable, Dict, FrozenSet, List, Tuple, Type
 
 # Third-party imports
 from rest_framework.exceptions import MethodNotAllowed
@@ -23,9 +23,19 @@ from teatype.logging import *
 from teatype.toolkit import kebabify
 from teatype.comms.http.responses import Conflict, Gone, NotAllowed, ServerError, Success
 
-_COLLECTION_METHODS=['GET', 'POST']
-_DATA_REQUIRED_METHODS=['POST', 'PUT', 'PATCH']
-_RESOURCE_METHODS=['GET', 'PUT', 'PATCH', 'DELETE']
+_COLLECTION_METHODS=frozenset(['GET', 'POST'])
+_DATA_REQUIRED_METHODS=frozenset(['POST', 'PUT', 'PATCH'])
+_HYBRID_STORAGE=None # Singleton resolved on the first auto mode request
+_RESERVED_QUERY_PARAMS=frozenset(['include_relations', 'expand_relations', 'sort', 'order',
+                                  'page', 'page_size', 'limit', 'offset', 'fields', 'ids_only'])
+_RESOURCE_METHODS=frozenset(['GET', 'PUT', 'PATCH', 'DELETE'])
+
+def _get_storage() -> HybridStorage:
+    global _HYBRID_STORAGE
+    storage = _HYBRID_STORAGE
+    if storage is None:
+        storage = _HYBRID_STORAGE = HybridStorage.instance()
+    return storage
 
 # TODO: Create a seperate base class without hsdb support
 # TODO: Check if request method is implemented without auto_view
@@ -40,11 +50,59 @@ class HSDBDjangoView(APIView):
     overwrite_api_plural_name:str=None
     overwrite_api_path:str=None
     
+    # Routing names and allowed methods only depend on the class, computed once in __init_subclass__
+    _allowed_methods:FrozenSet[str]
+    _api_id:str
+    _api_name:str
+    _api_path:str
+    _api_plural_name:str
+    _dispatch:Dict[str, Callable] # HTTP method -> unbound auto mode handler
+    _registry:Dict[str, List[type]]={} # Module name -> concrete views defined in it, in definition order
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every view registers itself on definition, so route discovery never scans module namespaces.
+        # The generic base views of this module are left out
+        if cls.__module__ != __name__:
+            HSDBDjangoView._registry.setdefault(cls.__module__, []).append(cls)
+        
+        if not hasattr(cls, 'is_collection'):
+            return # Abstract intermediate view, resolved once a subclass decides the view type
+        
+        parsed_name = kebabify(cls.__name__)
+        cls._api_id = f'{parsed_name}_id'
+        cls._api_name = cls.overwrite_api_name if cls.overwrite_api_name else parsed_name
+        if cls.is_collection:
+            cls._api_plural_name = cls._api_name
+        else:
+            cls._api_plural_name = cls._api_name + 's' if not cls._api_name.endswith('s') else cls._api_name
+            # cls._api_plural_name = cls._api_name + 's' if not cls._api_name.endswith('s') else cls._api_name + 'es'
+        
+        # TODO: consider api parents
+        if cls.overwrite_api_path:
+            cls._api_path = cls.overwrite_api_path
+        elif cls.is_collection:
+            cls._api_path = parsed_name
+        else:
+            cls._api_path = f'{cls._api_plural_name}/<str:{cls._api_id}>'
+        
+        methods = _COLLECTION_METHODS if cls.is_collection else _RESOURCE_METHODS
+        # The HTTP methods the class implements (DRF handlers are lower-case) that its view type supports
+        cls._allowed_methods = frozenset(method_name.upper() for method_name in ('get', 'post', 'put', 'patch', 'delete')
+                                         if callable(getattr(cls, method_name, None))) & methods
+        
+        # Resolved through the class, so subclasses overriding a handler are dispatched to their own
+        cls._dispatch = {
+            'GET': cls._get_impl,
+            'POST': cls._post_impl,
+            'PUT': cls._put_impl,
+            'PATCH': cls._put_impl,
+            'DELETE': cls._delete_impl,
+        }
+    
     @property
-    def allowed_methods(self) -> List[str]:
-        if self.is_collection:
-            return [method for method in dir(self) if method in _COLLECTION_METHODS]
-        return [method for method in dir(self) if method in _RESOURCE_METHODS]
+    def allowed_methods(self) -> FrozenSet[str]:
+        return self._allowed_methods
     
     def _parse_bool_param(self, value:any) -> bool:
         """Parse a query parameter value to a boolean."""
@@ -64,6 +122,7 @@ class HSDBDjangoView(APIView):
             if self.hsdb_model is None:
                 raise ValueError('Can\' use auto mode without specifying a hsdb_model in view')
             
+            data = None
             if request.method in _DATA_REQUIRED_METHODS:
                 if not request.data:
                     return NotAllowed(f'Data is required for {request.method} requests')
@@ -73,145 +132,126 @@ class HSDBDjangoView(APIView):
                 
                 data = request.data[self.data_key]
             
-            hybrid_storage = HybridStorage.instance()
-            
-            # Parse serialization options from query params
-            include_relations = self._parse_bool_param(request.GET.get('include_relations'))
-            expand_relations = self._parse_bool_param(request.GET.get('expand_relations'))
-            
-            match request.method:
-                case 'GET':
-                    if self.is_collection:
-                        # Check if there are any query params (excluding reserved ones)
-                        query_params = dict(request.GET)
-                        has_filter_params = any(
-                            key not in {'include_relations', 'expand_relations', 'sort', 'order', 
-                                       'page', 'page_size', 'limit', 'offset', 'fields', 'ids_only'}
-                            for key in query_params.keys()
-                        )
-                        
-                        if has_filter_params or any(k in query_params for k in ['sort', 'page', 'page_size', 'limit']):
-                            # Build query from params
-                            query = HSDBQuery.from_params(self.hsdb_model, query_params)
-                            results = query.collect()
-                            
-                            # Serialize results
-                            query_response = [
-                                entry.model.serialize(entry, 
-                                                     include_relations=include_relations,
-                                                     expand_relations=expand_relations)
-                                for entry in results
-                            ]
-                        else:
-                            # No filtering, get all entries
-                            query_response = hybrid_storage.fetch_model_entries(
-                                self.hsdb_model, 
-                                serialize=True,
-                                include_relations=include_relations,
-                                expand_relations=expand_relations
-                            )
-                    else:
-                        id = kwargs.get(self.api_id())
-                        query_response = hybrid_storage.fetch_entry(
-                            id, 
-                            serialize=True,
-                            include_relations=include_relations,
-                            expand_relations=expand_relations
-                        )
-                case 'POST':
-                    query_response, return_code = hybrid_storage.create_entry(self.hsdb_model, data)
-                    if return_code == 409:
-                        return Conflict('Entry already exists', data=query_response)
-                    elif return_code == 410:
-                        return Gone('Entry was lost')
-                    elif return_code == 500:
-                        return ServerError('Internal server error during entry creation')
-                    # Serialize the created entry
-                    if query_response:
-                        query_response = query_response.model.serialize(
-                            query_response,
-                            include_relations=include_relations,
-                            expand_relations=expand_relations
-                        )
-                case 'PUT':
-                    id = kwargs.get(self.api_id())
-                    if not id:
-                        return NotAllowed('ID is required for PUT requests')
-                    query_response, return_code = hybrid_storage.update_entry(id, data)
-                    if return_code == 404:
-                        return NotAllowed('Entry not found')
-                    elif return_code == 500:
-                        return ServerError('Internal server error during entry update')
-                    # Serialize the updated entry
-                    if query_response:
-                        query_response = query_response.model.serialize(
-                            query_response,
-                            include_relations=include_relations,
-                            expand_relations=expand_relations
-                        )
-                case 'PATCH':
-                    id = kwargs.get(self.api_id())
-                    if not id:
-                        return NotAllowed('ID is required for PATCH requests')
-                    query_response, return_code = hybrid_storage.update_entry(id, data)
-                    if return_code == 404:
-                        return NotAllowed('Entry not found')
-                    elif return_code == 500:
-                        return ServerError('Internal server error during entry update')
-                    # Serialize the updated entry
-                    if query_response:
-                        query_response = query_response.model.serialize(
-                            query_response,
-                            include_relations=include_relations,
-                            expand_relations=expand_relations
-                        )
-                case 'DELETE':
-                    id = kwargs.get(self.api_id())
-                    if not id:
-                        return NotAllowed('ID is required for DELETE requests')
-                    success, return_code = hybrid_storage.delete_entry(id)
-                    if return_code == 404:
-                        return NotAllowed('Entry not found')
-                    elif return_code == 500:
-                        return ServerError('Internal server error during entry deletion')
-                    query_response = {'deleted': True, 'id': id}
-            # TODO: Implement proper query_response handling
-            if query_response is not None:
-                return Success(query_response)
-            else:
-                query_response_error = 'Query-response was "None"'
-                err(query_response_error, verbose=False)
-                return ServerError({'message': query_response_error})
+            # The handler of every method is resolved from the per-class table instead of a match cascade
+            handler = self._dispatch.get(request.method)
+            if handler is None:
+                return NotAllowed(f'Method {request.method} is not supported in auto mode')
+            return handler(self, request, kwargs, _HYBRID_STORAGE or _get_storage(), data)
         except Exception as exc:
             err('Exception during auto method handling', traceback=True)
             return ServerError(str(exc))
     
+    def _respond(self, query_response):
+        # TODO: Implement proper query_response handling
+        if query_response is not None:
+            return Success(query_response)
+        else:
+            query_response_error = 'Query-response was "None"'
+            err(query_response_error, verbose=False)
+            return ServerError({'message': query_response_error})
+    
+    def _relation_flags(self, request) -> Tuple[bool, bool]:
+        """Parse the serialization options from the query params."""
+        return (self._parse_bool_param(request.GET.get('include_relations')),
+                self._parse_bool_param(request.GET.get('expand_relations')))
+    
+    def _get_impl(self, request, kwargs, hybrid_storage, data):
+        include_relations, expand_relations = self._relation_flags(request)
+        if self.is_collection:
+            # Check if there are any query params (excluding reserved ones)
+            query_params = dict(request.GET)
+            has_filter_params = any(key not in _RESERVED_QUERY_PARAMS for key in query_params.keys())
+            
+            if has_filter_params or any(k in query_params for k in ['sort', 'page', 'page_size', 'limit']):
+                # Build query from params
+                query = HSDBQuery.from_params(self.hsdb_model, query_params)
+                results = query.collect()
+                
+                # Serialize results
+                return self._respond([
+                    entry.model.serialize(entry, 
+                                         include_relations=include_relations,
+                                         expand_relations=expand_relations)
+                    for entry in results
+                ])
+            # No filtering, get all entries
+            return self._respond(hybrid_storage.fetch_model_entries(
+                self.hsdb_model, 
+                serialize=True,
+                include_relations=include_relations,
+                expand_relations=expand_relations
+            ))
+        id = kwargs.get(self.api_id())
+        return self._respond(hybrid_storage.fetch_entry(
+            id, 
+            serialize=True,
+            include_relations=include_relations,
+            expand_relations=expand_relations
+        ))
+    
+    def _post_impl(self, request, kwargs, hybrid_storage, data):
+        include_relations, expand_relations = self._relation_flags(request)
+        query_response, return_code = hybrid_storage.create_entry(self.hsdb_model, data)
+        if return_code == 409:
+            return Conflict('Entry already exists', data=query_response)
+        elif return_code == 410:
+            return Gone('Entry was lost')
+        elif return_code == 500:
+            return ServerError('Internal server error during entry creation')
+        # Serialize the created entry
+        if query_response:
+            query_response = query_response.model.serialize(
+                query_response,
+                include_relations=include_relations,
+                expand_relations=expand_relations
+            )
+        return self._respond(query_response)
+    
+    def _put_impl(self, request, kwargs, hybrid_storage, data):
+        # PATCH shares this handler, both replace the given attributes
+        id = kwargs.get(self.api_id())
+        if not id:
+            return NotAllowed(f'ID is required for {request.method} requests')
+        include_relations, expand_relations = self._relation_flags(request)
+        query_response, return_code = hybrid_storage.update_entry(id, data)
+        if return_code == 404:
+            return NotAllowed('Entry not found')
+        elif return_code == 409:
+            return Conflict('A unique value is already taken by another entry', data=query_response.model.serialize(query_response))
+        elif return_code == 500:
+            return ServerError('Internal server error during entry update')
+        # Serialize the updated entry
+        if query_response:
+            query_response = query_response.model.serialize(
+                query_response,
+                include_relations=include_relations,
+                expand_relations=expand_relations
+            )
+        return self._respond(query_response)
+    
+    def _delete_impl(self, request, kwargs, hybrid_storage, data):
+        id = kwargs.get(self.api_id())
+        if not id:
+            return NotAllowed('ID is required for DELETE requests')
+        success, return_code = hybrid_storage.delete_entry(id)
+        if return_code == 404:
+            return NotAllowed('Entry not found')
+        elif return_code == 500:
+            return ServerError('Internal server error during entry deletion')
+        return self._respond({'deleted': True, 'id': id})
+    
     # TODO: Figure out how to make these work as properties
     def api_id(self) -> str:
-        parsed_name = kebabify(type(self).__name__)
-        return f'{parsed_name}_id'
+        return self._api_id
     
     def api_name(self) -> str:
-        if self.overwrite_api_name:
-            return self.overwrite_api_name
-        return kebabify(type(self).__name__)
+        return self._api_name
     
     def api_plural_name(self) -> str:
-        api_name = self.api_name()
-        if self.is_collection:
-            return api_name
-        return api_name + 's' if not api_name.endswith('s') else api_name
-        # return api_name + 's' if not api_name.endswith('s') else api_name + 'es'
+        return self._api_plural_name
     
-    # TODO: consider api parents
     def api_path(self) -> str:
-        if self.overwrite_api_path:
-            return self.overwrite_api_path
-        
-        parsed_name = kebabify(type(self).__name__)
-        if self.is_collection:
-            return f'{parsed_name}'
-        return f'{self.api_plural_name()}/<str:{self.api_id()}>'
+        return self._api_path
 
     def initial(self, request, *args, **kwargs) -> None:
         """
@@ -223,29 +263,17 @@ class HSDBDjangoView(APIView):
             return NotAllowed(f'You can\'t use {request_method} requests on collections.')
 
         if request_method not in self.allowed_methods:
-            return NotAllowed(f'Method not allowed. Allowed methods: {self.allowed_methods}')
+            return NotAllowed(f'Method not allowed. Allowed methods: {sorted(self.allowed_methods)}')
         
     def handle_exception(self, exc):
         if isinstance(exc, MethodNotAllowed):
-            return NotAllowed(f'Method not allowed. Allowed methods: {self.allowed_methods}')
-
-    def get(self, request, *args, **kwargs):
-        return self._auto_method(request, kwargs)
-    
-    def post(self, request, *args, **kwargs):
-        return self._auto_method(request, kwargs)
-
-    def post(self, request, *args, **kwargs):
-        return self._auto_method(request, kwargs)
-
-    def put(self, request, *args, **kwargs):
-        return self._auto_method(request, kwargs)
+            return NotAllowed(f'Method not allowed. Allowed methods: {sorted(self.allowed_methods)}')
 
-    def patch(self, request, *args, **kwargs):
+    def _auto_handler(self, request, *args, **kwargs):
         return self._auto_method(request, kwargs)
     
-    def delete(self, request, *args, **kwargs):
-        return self._auto_method(request, kwargs)
+    # Every HTTP verb shares the one auto mode handler, dispatching happens in _auto_method
+    get = post = put = patch = delete = _auto_handler
     
 class HSDBDjangoResource(HSDBDjangoView):
     is_collection:bool=False
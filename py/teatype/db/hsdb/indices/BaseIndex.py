@@ -12,8 +12,13 @@
 
 # Standard-library imports
 import threading
+from types import MappingProxyType
 
 class BaseIndex:
+    # Reads go straight to primary_index: single dict lookups and C-level copies are
+    # atomic under the GIL, so only mutations need to serialise on transaction_lock.
+    __slots__ = ('primary_index', 'transaction_lock')
+    
     primary_index:dict
     transaction_lock:threading.RLock
     
@@ -28,8 +33,7 @@ class BaseIndex:
     ##################
     
     def __contains__(self, entry_id:str) -> bool:
-        with self.transaction_lock:
-            return entry_id in self.primary_index
+        return entry_id in self.primary_index
 
     def __copy__(self):
         new_index = self.__class__()
@@ -52,19 +56,18 @@ class BaseIndex:
             return self.primary_index == other.primary_index
 
     def __hash__(self):
-        with self.transaction_lock:
-            return hash(frozenset(self.primary_index.items()))
+        # Equal indices always hold the same number of entries, so the size is a hash consistent with __eq__.
+        # O(1) without bookkeeping in the subclasses and no longer fails on unhashable entry values
+        return hash(len(self.primary_index))
 
     def __getitem__(self, entry_id:str) -> dict | None:
         return self.fetch(entry_id)
 
     def __iter__(self):
-        with self.transaction_lock:
-            return iter(self.primary_index.values())
+        return iter(self.primary_index.values())
 
     def __len__(self) -> int:
-        with self.transaction_lock:
-            return len(self.primary_index.keys())
+        return len(self.primary_index)
 
     def __ne__(self, other):
         if not isinstance(other, BaseIndex):
@@ -72,12 +75,10 @@ class BaseIndex:
         return not self.__eq__(other)
 
     def __next__(self):
-        with self.transaction_lock:
-            return next(iter(self.primary_index.items()))
+        return next(iter(self.primary_index.items()))
 
     def __reversed__(self):
-        with self.transaction_lock:
-            return reversed(self.primary_index.items())
+        return reversed(self.primary_index.items())
 
     def __setitem__(self, entry_id:str, entry_data: dict) -> None:
         self.add(entry_id, entry_data)
@@ -91,24 +92,21 @@ class BaseIndex:
         """
         Get all keys in the index.
         """
-        with self.transaction_lock:
-            return list(self.primary_index.keys())
+        return list(self.primary_index)
     
     @property
     def items(self) -> dict:
         """
         Get all items in the index.
         """
-        with self.transaction_lock:
-            return self.primary_index.items()
+        return self.primary_index.items()
     
     @property 
     def values(self) -> dict:
         """
         Get all values in the index.
         """
-        with self.transaction_lock:
-            return self.primary_index.values()
+        return self.primary_index.values()
     
     #################
     # Index Methods #
@@ -127,39 +125,44 @@ class BaseIndex:
         """
         Clear the entire index.
         """
-        self.primary_index.clear()
+        with self.transaction_lock:
+            self.primary_index.clear()
         
     def fetch(self, entry_id:str) -> dict|None:
         """
         Fetch an entry from the index by its ID.
         """
-        with self.transaction_lock:
-            if entry_id not in self.primary_index:
-                raise KeyError(f'Entry with ID {entry_id} does not exist in the index.')
-            return self.primary_index.get(entry_id)
+        try:
+            return self.primary_index[entry_id]
+        except KeyError:
+            raise KeyError(f'Entry with ID {entry_id} does not exist in the index.') from None
         
-    def fetch_all(self) -> dict:
+    def fetch_all(self) -> MappingProxyType:
         """
-        Get all entries in the index.
+        Get all entries in the index as a read-only live view, no copy is made.
         """
-        with self.transaction_lock:
-            return self.primary_index
+        return MappingProxyType(self.primary_index)
     
     def remove(self, entry_id:str) -> None:
         """
         Delete an entry from the index by its ID.
         """
         with self.transaction_lock:
-            if self.fetch(entry_id):
+            try:
                 del self.primary_index[entry_id]
-            else:
-                raise KeyError(f'Entry with ID {entry_id} does not exist in the index.')
+            except KeyError:
+                raise KeyError(f'Entry with ID {entry_id} does not exist in the index.') from None
+    
+    def snapshot(self) -> dict:
+        """
+        Get a copy of all entries in the index that stays stable while the index is mutated.
+        """
+        with self.transaction_lock:
+            return self.primary_index.copy()
     
     def update(self, entry_data:dict) -> None:
         """
         Update or add entries in the index.
         """
         with self.transaction_lock:
-            for entry_id in entry_data:
-                entry = entry_data[entry_id]
-                self.primary_index.update({entry_id: entry})
\ No newline at end of file
+            self.primary_index.update(entry_data)
\ No newline at end of file
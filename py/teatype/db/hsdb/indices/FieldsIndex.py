@@ -11,7 +11,8 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
-from typing import Any, Set
+import sys
+from typing import Any, Dict, Set, Tuple
 
 # Third-party imports
 from teatype.db.hsdb.indices.BaseIndex import BaseIndex
@@ -32,15 +33,24 @@ class FieldsIndex(BaseIndex):
     
     Provides O(1) lookups for "find all entries where field X equals value Y".
     """
+    __slots__ = ('_index_keys',)
+    
+    _index_keys:Dict[Tuple[str, str], str] # Interned composite keys, built once per model field
     
     def __init__(self,
                  cache_entries:bool=False,
                  max_size:int=None) -> None:
         super().__init__(cache_entries=cache_entries, max_size=max_size)
+        self._index_keys = dict()
     
     def _get_index_key(self, model_name:str, field_name:str) -> str:
         """Generate the composite key for model.field indexing."""
-        return f'{model_name}.{field_name}'
+        # Reusing one interned string per model field, so the index lookups compare by identity
+        # instead of hashing and comparing a freshly formatted key on every call
+        index_key = self._index_keys.get((model_name, field_name))
+        if index_key is None:
+            index_key = self._index_keys.setdefault((model_name, field_name), sys.intern(f'{model_name}.{field_name}'))
+        return index_key
     
     def add_entry(self, model_name:str, field_name:str, value:Any, entry_id:str) -> None:
         """
@@ -23,6 +23,8 @@ class Index(BaseIndex):
     Index that extends BaseIndex with support for HSDBField types.
     Automatically converts HSDBField objects to strings using transmute_id.
     """
+    __slots__ = ('primary_index_key',)
+    
     primary_index_key:str
     
     def __init__(self,
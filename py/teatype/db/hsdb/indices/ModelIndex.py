@@ -29,6 +29,7 @@ class ModelIndex(BaseIndex):
     
     Provides O(1) lookups for "find all entries of model type X".
     """
+    __slots__ = ()
     
     def __init__(self,
                  cache_entries:bool=False,
@@ -67,10 +68,8 @@ class ModelIndex(BaseIndex):
             model_name: Name of the model class
             entry_id: The entry ID to add
         """
-        with self.transaction_lock:
-            if model_name not in self.primary_index:
-                self.primary_index[model_name] = set()
-            self.primary_index[model_name].add(entry_id)
+        # setdefault and set.add are each atomic under the GIL, so the insert needs no lock
+        self.primary_index.setdefault(model_name, set()).add(entry_id)
     
     def remove_entry(self, model_name:str, entry_id:str) -> None:
         """
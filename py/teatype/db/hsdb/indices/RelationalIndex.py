@@ -11,7 +11,8 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
-from typing import List
+import threading
+from typing import Dict, List, Set
 
 # Third-party imports
 from teatype.db.hsdb import HSDBField
@@ -22,9 +23,7 @@ from teatype.db.hsdb.toolbox import transmute_id
 Following structure for different relation types:
     one-to-one:
         primary_index: {
-            relation_name: {
-                primary_key[str]: secondary_key[str]
-            }
+            (relation_name, primary_key[str]): secondary_key[str]
         }
         reverse_index: {
             relation_name: {
@@ -34,9 +33,7 @@ Following structure for different relation types:
         
     many-to-one:
         primary_index: {
-            relation_name: {
-                primary_key[str]: secondary_key[str]
-            }
+            (relation_name, primary_key[str]): secondary_key[str]
         }
         reverse_index: {
             relation_name: {
@@ -47,16 +44,22 @@ Following structure for different relation types:
     many-to-many:
         primary_index: {
             relation_name: {
-                primary_keys: [primary_key[str]],
-                secondary_keys: [secondary_key[str]]
+                primary_keys: {primary_key[str]},
+                secondary_keys: {secondary_key[str]}
             }
         }
         reverse_index: None
 
 Info:
     relation_name consists of <primary_model>_<relation_type>_<secondary_model>
+    The key pairs are stored flat under (relation_name, primary_key), a fetch is a single dict probe.
+    The primary keys of every relation are tracked in relation_members for the per-relation lookups.
 """
 class RelationalIndex(Index):
+    __slots__ = ('_relation_locks', 'relation_members', 'reverse_index')
+    
+    _relation_locks:Dict[str, threading.Lock] # One lock per relation name, so unrelated relations are updated in parallel
+    relation_members:Dict[str, Set[str]] # Primary keys paired in every one-to-one and many-to-one relation
     reverse_index:dict
     
     def __init__(self,
@@ -64,7 +67,18 @@ class RelationalIndex(Index):
                  max_size:int=None) -> None:
         super().__init__(cache_entries, max_size)
         
+        self._relation_locks = dict()
+        self.relation_members = dict()
         self.reverse_index = dict()
+    
+    def _locks_for(self, *relation_names:str) -> List[threading.Lock]:
+        """
+        Resolve the locks of the given relations, sorted by name so every caller acquires them in the same order.
+        """
+        relation_locks = self._relation_locks
+        # setdefault is atomic under the GIL, concurrent first uses of a name still end up with one lock
+        return [relation_locks.get(relation_name) or relation_locks.setdefault(relation_name, threading.Lock())
+                for relation_name in sorted(set(relation_names))]
         
     def add(self,
             relation_name:str,
@@ -75,42 +89,60 @@ class RelationalIndex(Index):
         """
         Add an entry to the index.
         """
-        with self.transaction_lock:
-            if relation_name not in self.primary_index:
-                self.primary_index[relation_name] = {}
-                
+        # Only the touched relation and its reverse are locked, instead of the whole index
+        locks = self._locks_for(relation_name, reverse_relation_name)
+        for lock in locks:
+            lock.acquire()
+        try:
             if relation_type == 'one-to-one' or relation_type == 'many-to-one':
                 if reverse_relation_name not in self.reverse_index:
                     self.reverse_index[reverse_relation_name] = {}
                     
                 primary_key = transmute_id(primary_keys[0])
                 secondary_key = transmute_id(secondary_keys[0])
+                pair_key = (relation_name, primary_key)
+                # Re-adding an unchanged pair is a no-op, skipping it keeps the reverse lists free of duplicates
+                if self.primary_index.get(pair_key) == secondary_key:
+                    return
+                self.primary_index[pair_key] = secondary_key
+                self.relation_members.setdefault(relation_name, set()).add(primary_key)
                 if relation_type == 'one-to-one':
-                    self.primary_index[relation_name][primary_key] = secondary_key
                     self.reverse_index[reverse_relation_name][secondary_key] = primary_key
                 else:
-                    self.primary_index[relation_name][primary_key] = secondary_key
                     if secondary_key not in self.reverse_index[reverse_relation_name]:
                         self.reverse_index[reverse_relation_name][secondary_key] = []
                     self.reverse_index[reverse_relation_name][secondary_key].append(primary_key)
             else:
-                self.primary_index[relation_name]['primary_keys'] = [transmute_id(primary_key) for primary_key in primary_keys]
-                self.primary_index[relation_name]['secondary_keys'] = [transmute_id(secondary_key) for secondary_key in secondary_keys]
+                # The keys are collected in sets, repeated links are dropped and membership checks stay O(1)
+                bucket = self.primary_index.get(relation_name)
+                if bucket is None:
+                    bucket = self.primary_index[relation_name] = {'primary_keys': set(), 'secondary_keys': set()}
+                bucket['primary_keys'].update(transmute_id(primary_key) for primary_key in primary_keys)
+                bucket['secondary_keys'].update(transmute_id(secondary_key) for secondary_key in secondary_keys)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
         
     def clear(self, relation_name:str=None, reverse_lookup:bool=False) -> None:
         """
-        Clear the entire index.
+        Clear the entire index, or a single relation of it.
         """
-        if reverse_lookup:
-            target_index = self.reverse_index[relation_name]
-        else:
-            target_index = self.primary_index[relation_name]
+        if relation_name is None:
+            with self.transaction_lock:
+                if reverse_lookup:
+                    self.reverse_index.clear()
+                else:
+                    self.primary_index.clear()
+                    self.relation_members.clear()
+            return
         
-        with self.transaction_lock:
-            if relation_name is None:
-                target_index.clear()
+        with self._locks_for(relation_name)[0]:
+            if reverse_lookup:
+                self.reverse_index.get(relation_name, {}).clear()
             else:
-                target_index[relation_name].clear()
+                for primary_key in self.relation_members.pop(relation_name, ()):
+                    self.primary_index.pop((relation_name, primary_key), None)
+                self.primary_index.pop(relation_name, None)
         
     def fetch(self, relation_name:str, target_id:HSDBField, reverse_lookup:bool=False) -> dict|None:
         """
@@ -118,41 +150,45 @@ class RelationalIndex(Index):
         """
         target_id = transmute_id(target_id)
         if reverse_lookup:
-            target_index = self.reverse_index[relation_name]
-        else:
-            target_index = self.primary_index[relation_name]
-        
-        with self.transaction_lock:
-            return target_index.get(target_id)
+            return self.reverse_index[relation_name].get(target_id)
+        return self.primary_index.get((relation_name, target_id))
         
     def fetch_all(self, relation_name:str, reverse_lookup:bool=False) -> dict:
         """
         Get all entries in the index.
+        With a relation name, the pairs of that relation (key -> related key(s)) are returned,
+        resolved through the relation's tracked members instead of scanning the whole index.
         """
         if reverse_lookup:
-            target_index = self.reverse_index[relation_name]
-        else:
-            target_index = self.primary_index[relation_name]
-            
-        with self.transaction_lock:
             if relation_name is None:
-                return target_index
-            return target_index[relation_name]
+                return self.reverse_index
+            return self.reverse_index.get(relation_name, {})
+        if relation_name is None:
+            return self.primary_index
+        primary_index = self.primary_index
+        bucket = primary_index.get(relation_name)
+        if bucket is not None:
+            # Many-to-many keys are handed out as tuple snapshots, callers get indexable access
+            # and the sets of the index can keep growing underneath
+            return {'primary_keys': tuple(bucket['primary_keys']),
+                    'secondary_keys': tuple(bucket['secondary_keys'])}
+        return {primary_key: primary_index[(relation_name, primary_key)]
+                for primary_key in list(self.relation_members.get(relation_name, ()))}
     
     def remove(self, relation_name:str, target_id:HSDBField, reverse_lookup:bool=False) -> dict|None:
         """
         Delete an entry from the index by its ID.
         """
         target_id = transmute_id(target_id)
-        if reverse_lookup:
-            target_index = self.reverse_index[relation_name]
-        else:
-            target_index = self.primary_index[relation_name]
-            
-        with self.transaction_lock:
-            if self.fetch(relation_name, target_id, reverse_lookup) is None:
-                raise KeyError(f'Entry with ID {target_id} does not exist in the index.')
-            del target_index[relation_name][target_id]
+        with self._locks_for(relation_name)[0]:
+            try:
+                if reverse_lookup:
+                    del self.reverse_index[relation_name][target_id]
+                else:
+                    del self.primary_index[(relation_name, target_id)]
+                    self.relation_members[relation_name].discard(target_id)
+            except KeyError:
+                raise KeyError(f'Entry with ID {target_id} does not exist in the index.') from None
             
 # from django.contrib import admin
 # from django.urls import path
@@ -11,39 +11,59 @@
 # all copies or substantial portions of the Software.
 
 # Standard-library imports
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
 
 # Third-party imports
 from teatype.io import file
 from teatype.logging import *
 
-def parse_fixtures(fixtures_path:str) -> List[dict]:
-    fixture_files = file.list(fixtures_path, walk=False)
-    if len(fixture_files) == 0:
+# Fixture files read ahead while the current one is installed, bounds the parsed fixtures held at once
+_READ_AHEAD = 8
+
+def _read_fixture_files(fixture_paths:List[str]) -> Iterator[dict]:
+    """
+    Yield the parsed fixture files in order, with the following reads already running in the background.
+    """
+    with ThreadPoolExecutor(max_workers=min(_READ_AHEAD, len(fixture_paths))) as executor:
+        pending = deque()
+        for fixture_path in fixture_paths:
+            pending.append(executor.submit(file.read, fixture_path, force_format='json'))
+            if len(pending) == _READ_AHEAD:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def parse_fixtures(fixtures_path:str) -> Iterator[dict]:
+    """
+    Yield the fixtures one file at a time, so only the fixture currently being installed is held in memory.
+    """
+    # Only the JSON files count, the listing is filtered before the empty check
+    fixture_paths = [fixture_file.path for fixture_file in file.list(fixtures_path, walk=False)
+                     if fixture_file.name.endswith('.json')]
+    if not fixture_paths:
         return
     
     println()
     print('Found fixtures')
-    fixtures = []
-    for fixture_file in fixture_files:
-        if not fixture_file.name.endswith('.json'):
-            continue
-        
-        fixture = file.read(fixture_file.path, force_format='json')
-        fixture_model = fixture.get('model').split('.')
-        app_name = fixture_model[0]
-        model_name = fixture_model[1]
-        
+    # Disk reads overlap with the installation of the previous fixtures, file.read keeps handling
+    # the comment stripping and float sanitizing of the fixture JSON
+    for fixture in _read_fixture_files(fixture_paths):
         fixture_entries = fixture.get('fixtures')
-        amount_of_fixture_entries = len(fixture_entries)
-        if fixture_entries == 0:
-            continue
+        if not fixture_entries:
+            continue # Files without entries are skipped, empty lists included
+        
+        # Split once on the first dot by slicing, no intermediate list per fixture
+        fixture_model = fixture['model']
+        separator = fixture_model.find('.')
+        app_name = fixture_model[:separator]
+        model_name = fixture_model[separator + 1:]
         
         # TODO: Validate
-        fixtures.append(fixture)
         fixture['app'] = app_name
         fixture['model'] = model_name
         
-        print(f'    Installed {app_name}.{model_name} fixtures: {amount_of_fixture_entries}')
+        print(f'    Installed {app_name}.{model_name} fixtures: {len(fixture_entries)}')
+        yield fixture
     println()
-    return fixtures
\ No newline at end of file
@@ -12,12 +12,21 @@
 
 # Standard-library imports
 import json
-from typing import List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
 # Third-party imports
-from teatype.io import file, path
+import orjson
+from teatype.io import file
 from teatype.logging import *
-from teatype.toolkit import kebabify
+
+# Parsed index files are cached next to the model folders, keyed by path and validated by (mtime_ns, size)
+_CACHE_FILE_NAME = '.cache.json'
+_CACHE_VERSION = 2 # Bumped whenever the cache layout changes, a mismatching cache is discarded as a whole
+# Timestamps are compared in whole ticks of the coarsest common mtime granularity (FAT's 2 seconds),
+# so a file rewritten in the tick the cache was written in is never trusted, whatever the filesystem
+_MTIME_TICK_NS = 2_000_000_000
 
 class _ParsingError:
     entry_id:str
@@ -29,6 +38,87 @@ class _ParsingError:
         self.entry_model = entry_model
         self.error = error
 
+def _load_index_file(index_file_path:str) -> any:
+    """
+    Parse an index file straight from its bytes, files without content are returned as None.
+    """
+    with open(index_file_path, 'rb') as index_file:
+        buffer = index_file.read()
+    if not buffer.strip():
+        return None
+    try:
+        return orjson.loads(buffer)
+    except orjson.JSONDecodeError:
+        # Non-standard JSON (NaN, comments) is left to the lenient reader, which raises on corrupt files
+        return file.read(index_file_path, force_format='json', silent_fail=True)
+
+def _load_cache(cache_path:str) -> Dict[str, list]:
+    """
+    Load the cached index entries, a missing, outdated or unreadable cache yields an empty one.
+    """
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            # The mtime of the cache file comes from the same filesystem clock as the index files
+            cache_tick = os.fstat(cache_file.fileno()).st_mtime_ns // _MTIME_TICK_NS
+            cache = orjson.loads(cache_file.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != _CACHE_VERSION:
+        return {}
+    # Like git's racy check: files modified in the tick the cache was written in (or later) might have
+    # changed without a visible mtime change, their entries are not trusted and the files are parsed again
+    return {index_file_path: entry for index_file_path, entry in cache.get('entries', {}).items()
+            if entry[0] // _MTIME_TICK_NS < cache_tick}
+
+def _write_cache(cache_path:str, entries:Dict[str, list]) -> None:
+    """
+    Write the cached index entries, replacing the previous cache atomically.
+    """
+    temporary_path = f'{cache_path}.tmp'
+    try:
+        with open(temporary_path, 'wb') as cache_file:
+            cache_file.write(orjson.dumps({'version': _CACHE_VERSION, 'entries': entries}))
+        os.replace(temporary_path, cache_path)
+    except (OSError, TypeError):
+        # The cache is only an accelerator, failing to write it never fails the parsing
+        warn(f'Could not write the index cache "{cache_path}"', verbose=False)
+
+def _list_index_files(model_path:str) -> List[os.DirEntry]|None:
+    """
+    List the index files of a model folder, None if the folder does not exist.
+    """
+    try:
+        # A single scandir, the entry types come with the directory listing instead of a stat per file
+        with os.scandir(model_path) as entries:
+            return [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+def _parse_index_file(index_file:os.DirEntry, cached_entries:Dict[str, list]) -> Tuple[str, any, str|None, list|None]:
+    """
+    Read and parse a single index file, returning its id, its data, the parsing error if any
+    and its cache entry. Runs on the worker threads, so it only touches the file itself.
+    """
+    index_id = index_file.name.replace('.json', '')
+    try:
+        stat = index_file.stat() # Cached on the entry, at most one stat call per file
+    except OSError:
+        stat = None
+    if stat is not None:
+        cache_entry = cached_entries.get(index_file.path)
+        # Unchanged files are served from the cache, a stat call instead of a read and parse
+        if cache_entry is not None and cache_entry[0] == stat.st_mtime_ns and cache_entry[1] == stat.st_size:
+            return index_id, cache_entry[2], None, cache_entry
+    try:
+        # Empty files are detected on the raw bytes, before the parser is involved
+        index_data = _load_index_file(index_file.path)
+    except json.JSONDecodeError:
+        # TODO: More edge cases?
+        return index_id, None, 'corrupt', None
+    if not index_data:
+        return index_id, None, 'empty', None
+    return index_id, index_data, None, [stat.st_mtime_ns, stat.st_size, index_data] if stat is not None else None
+
 # TODO: Implement a better solution for this - only use one instance, check via type which class it is
 def parse_index_files(hybrid_storage_instance:object=None, migrator:object=None) -> List[dict]:
     if hybrid_storage_instance is None and migrator is None:
@@ -41,69 +131,76 @@ def parse_index_files(hybrid_storage_instance:object=None, migrator:object=None)
     if hybrid_storage_instance:
         models = hybrid_storage_instance.index_db.models
         index_path = hybrid_storage_instance.rf_handler.fs.index.path
+        write_cache = not hybrid_storage_instance.rf_handler.cold_mode # Cold mode never writes to disk
     else:
         models = migrator.models
         index_path = migrator._index_path
+        write_cache = False # The index folder of a migration is its source, it's only read
+    
+    cache_path = f'{index_path}/{_CACHE_FILE_NAME}'
+    cached_entries = _load_cache(cache_path)
+    updated_entries = {} # Only the files seen in this run are kept, deleted files drop out of the cache
     
     print('Parsing index files from disk')
     parsed_index_data = {}
     parsing_errors_found = False
-    for model in models:
-        model_plural_name = kebabify(model.__name__, plural=True, remove='-model')
-        model_path = f'{index_path}/{model_plural_name}'
-        if not path.exists(model_path):
-            continue
+    # File reads and orjson decoding release the GIL, the files of a model are parsed in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # The model folders are listed concurrently up front, the per-entry stat calls of the
+        # listings overlap instead of running one folder after the other
+        # The plural resource names are computed once per class by HSDBMeta
+        model_plural_names = [model.resource_name_plural for model in models]
+        listings = [executor.submit(_list_index_files, f'{index_path}/{model_plural_name}')
+                    for model_plural_name in model_plural_names]
+        for model_plural_name, listing in zip(model_plural_names, listings):
+            index_files = listing.result()
+            if index_files is None:
+                continue
         
-        parsed_index_data[model_plural_name] = []
-        if migrator:
-            migrator._migration_data['index'][model_plural_name] = []
-            migrator._rejectpile['index'][model_plural_name] = []
+            parsed_index_data[model_plural_name] = []
+            if migrator:
+                migrator._migration_data['index'][model_plural_name] = []
+                migrator._rejectpile['index'][model_plural_name] = []
         
-        index_files = file.list(f'{index_path}/{model_plural_name}',
-                                walk=False)
-        if len(index_files) == 0:
-            continue
+            if len(index_files) == 0:
+                continue
         
-        parsing_errors = []
-        for index_file in index_files:
-            index_id = index_file.name.replace('.json', '')
-            try:
-                index_data = file.read(index_file.path, force_format='json', silent_fail=True)
-                if index_data is None or index_data == {} or index_data == []:
+            parsing_errors = []
+            # map() keeps the directory order, the results are collected here on the calling thread
+            for index_file, (index_id, index_data, error, cache_entry) in zip(
+                    index_files, executor.map(_parse_index_file, index_files, [cached_entries] * len(index_files))):
+                if cache_entry is not None:
+                    updated_entries[index_file.path] = cache_entry
+                if error is not None:
                     parsing_errors.append(_ParsingError(index_id,
                                                         model_plural_name,
-                                                        'empty'))
+                                                        error))
                     continue
                 parsed_index_data[model_plural_name].append(index_data)
-            except json.JSONDecodeError as jde:
-                # TODO: More edge cases?
-                if jde.msg == 'Expecting value' and jde.doc == '' and jde.pos == 0 and jde.lineno == 1 and jde.colno == 1:
-                    parsing_errors.append(_ParsingError(index_id,
-                                                        model_plural_name,
-                                                        'empty'))
-                else:
-                    parsing_errors.append(_ParsingError(index_id,
-                                                        model_plural_name,
-                                                        'corrupt'))
-                if not parsing_errors_found:
-                    parsing_errors_found = True
+            if parsing_errors:
+                parsing_errors_found = True
                     
-        print(f'    Found "{model_plural_name}" index files: {len(index_files)}')
-        amount_of_parsing_errors = len(parsing_errors)
-        if amount_of_parsing_errors > 0:
-            warn(f'    Found {amount_of_parsing_errors} parsing error{"s" if amount_of_parsing_errors > 1 else ""}:', use_prefix=False)
-            for parsing_error in parsing_errors:
-                # TODO: Implement a better solution for this - seperate method in HSDBMigration
-                if migrator:
-                    migrator.reject_migration_index(parsing_error.entry_model,
-                                                    { 'id': parsing_error.entry_id },
-                                                    reason=f'index-{parsing_error.error}')
-                err(f'      {parsing_error.error}: {parsing_error.entry_id}', use_prefix=False, verbose=False)
-            println()
+            print(f'    Found "{model_plural_name}" index files: {len(index_files)}')
+            amount_of_parsing_errors = len(parsing_errors)
+            if amount_of_parsing_errors > 0:
+                warn(f'    Found {amount_of_parsing_errors} parsing error{"s" if amount_of_parsing_errors > 1 else ""}:', use_prefix=False)
+                for parsing_error in parsing_errors:
+                    # TODO: Implement a better solution for this - seperate method in HSDBMigration
+                    if migrator:
+                        migrator.reject_migration_index(parsing_error.entry_model,
+                                                        { 'id': parsing_error.entry_id },
+                                                        reason=f'index-{parsing_error.error}')
+                    err(f'      {parsing_error.error}: {parsing_error.entry_id}', use_prefix=False, verbose=False)
+                println()
+            
+    # The cache is only rewritten if any file was parsed, added or removed since it was written
+    if write_cache and (updated_entries.keys() != cached_entries.keys()
+                        or any(updated_entries[key] is not cached_entries[key] for key in updated_entries)):
+        _write_cache(cache_path, updated_entries)
             
     if not migrator:
         if parsing_errors_found:
-            hint(f'Parsing errors can cause database integrity to degrade, please check these files manually',
+            hint('Parsing errors can cause database integrity to degrade, please check these files manually',
                 pad_before=1,
                 verbose=False)
     return parsed_index_data
\ No newline at end of file
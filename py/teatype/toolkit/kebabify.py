@@ -12,6 +12,7 @@
 
 # Standard-library imports
 import re
+from functools import lru_cache
 from typing import Union
 
 KEBAB_STORE = {
@@ -38,6 +39,21 @@ def kebabify(raw_name:str,
     
     Returns the resulting kebab-case string, optionally modified by remove, replace, and plural rules.
     """
+    # Replacement pairs are normalized to tuples so every call is hashable for the memoized conversion
+    if replace is not None:
+        replace = tuple(replace)
+    return _kebabify(raw_name, plural, preserve_capitals, remove, replace, seperator)
+
+@lru_cache(maxsize=1024)
+def _kebabify(raw_name:str,
+              plural:bool,
+              preserve_capitals:bool,
+              remove:str,
+              replace:Union[str,str],
+              seperator:str) -> str:
+    """
+    Memoized conversion behind kebabify, names are converted once and served from the cache afterwards.
+    """
     # Insert separator before each uppercase letter (except at the start), then lowercase entire string
     if preserve_capitals:
         parsed_name = re.sub(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])', seperator, raw_name).lower()
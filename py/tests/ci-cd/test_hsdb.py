@@ -0,0 +1,355 @@
+# Copyright (C) 2024-2026 Burak Günaydin
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+
+# Standard-library imports
+import importlib
+import json
+import os
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party imports
+import pytest
+from teatype.db.hsdb import HSDBAttribute, HSDBModel, HybridStorage, IndexDatabase
+
+##################
+# Example Models #
+##################
+
+class TaggedModel(HSDBModel):
+    name = HSDBAttribute(str, required=True)
+    tag  = HSDBAttribute(str, indexed=True)
+
+class UniqueModel(HSDBModel):
+    code = HSDBAttribute(str, required=True, unique=True)
+
+class MeasuredModel(HSDBModel):
+    count = HSDBAttribute(int, required=True)
+    ratio = HSDBAttribute(float, required=True)
+
+#############
+#  Fixtures #
+#############
+
+@pytest.fixture
+def hybrid_storage():
+    # Model updates and saves resolve the singleton, the tests use its index database
+    return HybridStorage(cold_mode=True)
+
+##############
+# Unit tests #
+##############
+
+# IndexDatabase
+
+def test_create_entry_with_unset_optional_indexed_attribute():
+    index_db = IndexDatabase([TaggedModel])
+    entry, return_code = index_db.create_entry(TaggedModel, {'name': 'untagged'})
+    assert return_code == 200
+    entry_id = str(entry.id)
+    assert entry_id in index_db._db
+    assert entry_id in index_db.lookup_by_model('TaggedModel')
+    assert index_db.memory_footprint.size_in_bytes > 0
+    
+    tagged_entry, return_code = index_db.create_entry(TaggedModel, {'name': 'tagged', 'tag': 'red'})
+    assert return_code == 200
+    assert index_db.lookup_by_field('TaggedModel', 'tag', 'red') == {str(tagged_entry.id)}
+
+def test_field_index_leaves_out_the_id():
+    index_db = IndexDatabase([TaggedModel])
+    entry, _ = index_db.create_entry(TaggedModel, {'name': 'tagged', 'tag': 'blue'})
+    assert 'id' not in TaggedModel._indexed_names
+    assert index_db.lookup_by_field('TaggedModel', 'id', str(entry.id)) == set()
+    assert index_db.lookup_by_field('TaggedModel', 'tag', 'blue') == {str(entry.id)}
+
+def test_create_entry_rolls_back_a_failed_field_index_insert(monkeypatch):
+    index_db = IndexDatabase([TaggedModel])
+    def failing_insert(*args):
+        raise RuntimeError('field index unavailable')
+    monkeypatch.setattr(index_db, '_add_to_field_index', failing_insert)
+    entry, return_code = index_db.create_entry(TaggedModel, {'name': 'tagged', 'tag': 'green'})
+    assert (entry, return_code) == (None, 500)
+    assert len(index_db._db) == 0
+    assert index_db.lookup_by_model('TaggedModel') == set()
+    assert index_db.memory_footprint.size_in_bytes == 0
+
+def test_create_entry_rejects_a_taken_unique_value():
+    index_db = IndexDatabase([UniqueModel])
+    entry, return_code = index_db.create_entry(UniqueModel, {'code': 'A-1'})
+    assert return_code == 200
+    conflicting_entry, return_code = index_db.create_entry(UniqueModel, {'code': 'A-1'})
+    assert return_code == 409
+    assert conflicting_entry is entry
+    assert len(index_db.lookup_by_model('UniqueModel')) == 1
+
+def test_update_entry_rejects_a_taken_unique_value(hybrid_storage):
+    index_db = hybrid_storage.index_db
+    first_entry, _ = index_db.create_entry(UniqueModel, {'code': 'B-1'})
+    second_entry, _ = index_db.create_entry(UniqueModel, {'code': 'B-2'})
+    conflicting_entry, return_code = index_db.update_entry(second_entry.id, {'code': 'B-1'})
+    assert return_code == 409
+    assert conflicting_entry is first_entry
+    assert index_db.lookup_by_field('UniqueModel', 'code', 'B-1') == {str(first_entry.id)}
+    assert index_db.lookup_by_field('UniqueModel', 'code', 'B-2') == {str(second_entry.id)}
+    # Keeping its own value is no conflict
+    _, return_code = index_db.update_entry(second_entry.id, {'code': 'B-2'})
+    assert return_code == 200
+
+def test_save_rejects_a_taken_unique_value(hybrid_storage):
+    index_db = hybrid_storage.index_db
+    entry = UniqueModel({'code': 'C-1'}).save()
+    assert str(entry.id) in index_db.lookup_by_field('UniqueModel', 'code', 'C-1')
+    with pytest.raises(ValueError):
+        UniqueModel({'code': 'C-1'}).save()
+    assert index_db.lookup_by_field('UniqueModel', 'code', 'C-1') == {str(entry.id)}
+
+def test_memory_footprint_under_concurrent_inserts_of_different_models():
+    index_db = IndexDatabase([TaggedModel, UniqueModel])
+    def create(index):
+        if index % 2:
+            return index_db.create_entry(TaggedModel, {'name': f'tagged-{index}'})[1]
+        return index_db.create_entry(UniqueModel, {'code': f'D-{index}'})[1]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert set(executor.map(create, range(400))) == {200}
+    assert len(index_db._entry_sizes) == 400
+    assert index_db.memory_footprint.size_in_bytes == sum(index_db._entry_sizes.values())
+
+def test_save_accounts_the_entry(hybrid_storage):
+    index_db = hybrid_storage.index_db
+    entry = UniqueModel({'code': 'E-1'}).save()
+    assert index_db._entry_sizes[str(entry.id)] > 0
+
+def test_update_directly_with_unset_optional_indexed_attribute():
+    index_db = IndexDatabase([TaggedModel])
+    entry = TaggedModel({'name': 'untagged'})
+    index_db.update_directly({entry.id: entry})
+    assert str(entry.id) in index_db.lookup_by_model('TaggedModel')
+    # Replacing the entry unindexes the previous version, which has no tag either
+    index_db.update_directly({entry.id: entry})
+    assert str(entry.id) in index_db._db
+
+# HSDBMeta
+
+class SlottedModel(HSDBModel, slots=True):
+    name = HSDBAttribute(str, required=True)
+
+def test_models_keep_instance_dict_by_default():
+    entry = TaggedModel({'name': 'plain'})
+    entry.note = 'ad-hoc'
+    assert entry.note == 'ad-hoc'
+
+def test_slotted_models_reject_undeclared_attributes():
+    entry = SlottedModel({'name': 'slotted'})
+    assert not hasattr(entry, '__dict__')
+    with pytest.raises(AttributeError):
+        entry.note = 'ad-hoc'
+    entry.name = 'renamed'
+    assert str(entry.name) == 'renamed'
+
+# HSDBModel
+
+class LabelledModel(TaggedModel):
+    @property
+    def serializer(self) -> dict:
+        serialized = super().serializer
+        serialized['label'] = LABELS.get(serialized['name'], 'unlabelled')
+        return serialized
+
+LABELS = {}
+
+def test_mutating_the_serializer_leaves_serialize_untouched():
+    entry = TaggedModel({'name': 'original'})
+    serialized = entry.serializer
+    serialized['name'] = 'mutated'
+    assert TaggedModel.serialize(entry)['name'] == 'original'
+    assert '"original"' in TaggedModel.serialize(entry, json_dump=True)
+
+def test_overridden_serializer_is_never_cached():
+    entry = LabelledModel({'name': 'labelled'})
+    assert '"unlabelled"' in LabelledModel.serialize(entry, json_dump=True)
+    # The override reads state outside the fields, changing it has to show up without a field assignment
+    LABELS['labelled'] = 'relabelled'
+    assert '"relabelled"' in LabelledModel.serialize(entry, json_dump=True)
+    assert LabelledModel.serialize(entry)['label'] == 'relabelled'
+
+# HSDBQuery
+
+hsdb_query = importlib.import_module('teatype.db.hsdb.HSDBQuery')
+
+def _collect_ids(query) -> set:
+    return {str(entry.id) for entry in query.collect()}
+
+@pytest.fixture
+def measured_entries(hybrid_storage):
+    entries = [MeasuredModel({'count': 2**53 + index % 3, 'ratio': index / 4}) for index in range(60)]
+    hybrid_storage.index_db.update_directly({entry.id: entry for entry in entries})
+    return entries
+
+@pytest.mark.parametrize('attribute, operator, expected', [
+    ('count', 'equals', 2**53 + 1),
+    ('count', 'greater_than', 2**53),
+    ('ratio', 'less_than', 7.5),
+    ('ratio', 'greater_than_or_equals', 3.0),
+    ('count', 'equals', float(2**53)), # int column against a float, only exact on the per-entry path
+    ('ratio', 'less_than', 7), # float column against an int
+])
+def test_columnar_and_per_entry_filtering_match(monkeypatch, measured_entries, attribute, operator, expected):
+    monkeypatch.setattr(hsdb_query, '_VECTORIZE_THRESHOLD', 1)
+    columnar_ids = _collect_ids(getattr(MeasuredModel.query.where(attribute), operator)(expected))
+    monkeypatch.setattr(hsdb_query, '_VECTORIZE_THRESHOLD', float('inf'))
+    per_entry_ids = _collect_ids(getattr(MeasuredModel.query.where(attribute), operator)(expected))
+    assert columnar_ids == per_entry_ids
+
+def test_int_column_against_float_compares_exactly(monkeypatch, hybrid_storage, measured_entries):
+    monkeypatch.setattr(hsdb_query, '_VECTORIZE_THRESHOLD', 1)
+    matched_ids = _collect_ids(MeasuredModel.query.where('count').equals(float(2**53)))
+    # The singleton keeps the entries of earlier tests, all stored measurements are compared in Python
+    expected_ids = {entry_id for entry_id, entry in hybrid_storage.index_db._db.primary_index.items()
+                    if entry.model is MeasuredModel and entry.count._value == float(2**53)}
+    assert expected_ids
+    assert matched_ids == expected_ids
+
+def _count_of(entry):
+    return entry.count._value
+
+@pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+@pytest.mark.parametrize('page, page_size', [(0, 5), (1, 4)])
+def test_partial_sort_matches_sorted_slice(monkeypatch, measured_entries, sort_order, page, page_size):
+    # Only three distinct counts, every page cuts through a run of tied sort keys
+    unsorted = MeasuredModel.query.collect()
+    assert len(unsorted) >= (page + 1) * page_size * hsdb_query._PARTIAL_SORT_RATIO
+    expected = sorted(unsorted, key=_count_of, reverse=sort_order == 'desc')[page * page_size:(page + 1) * page_size]
+    partial = MeasuredModel.query.sort_by('count', sort_order).paginate(page, page_size)
+    assert [str(entry.id) for entry in partial] == [str(entry.id) for entry in expected]
+    monkeypatch.setattr(hsdb_query, '_PARTIAL_SORT_RATIO', float('inf'))
+    fully_sorted = MeasuredModel.query.sort_by('count', sort_order).paginate(page, page_size)
+    assert [str(entry.id) for entry in fully_sorted] == [str(entry.id) for entry in expected]
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_order_with_limit_keeps_tie_order(reverse):
+    queryset = [(index % 3, index) for index in range(30)]
+    expected = sorted(queryset, key=lambda item: item[0], reverse=reverse)[:7]
+    assert hsdb_query._order(list(queryset), lambda item: item[0], reverse, 7) == expected
+
+@pytest.mark.parametrize('attribute, operator, expected', [
+    ('count', 'equals', 2**53 + 1),
+    ('ratio', 'greater_than', 4.0),
+    ('ratio', 'less_than', -1.0), # No matches
+])
+def test_first_and_last_match_collected_ends(measured_entries, attribute, operator, expected):
+    collected = getattr(MeasuredModel.query.where(attribute), operator)(expected).collect()
+    first = getattr(MeasuredModel.query.where(attribute), operator)(expected).first()
+    last = getattr(MeasuredModel.query.where(attribute), operator)(expected).last()
+    if not collected:
+        assert first is None and last is None
+    else:
+        assert str(first.id) == str(collected[0].id)
+        assert str(last.id) == str(collected[-1].id)
+
+# parse_index_files
+
+index_file_parsing = importlib.import_module('teatype.db.hsdb.toolbox.parse_index_files')
+
+_AN_HOUR_AGO_NS = time.time_ns() - 3600 * 1_000_000_000
+
+def _write_index_file(index_path, entry_id:str, payload:str, mtime_ns:int=_AN_HOUR_AGO_NS):
+    index_file_path = index_path / 'tagged' / f'{entry_id}.json'
+    index_file_path.parent.mkdir(parents=True, exist_ok=True)
+    index_file_path.write_text(json.dumps({'base_data': {'id': entry_id}, 'data': {'payload': payload}}))
+    os.utime(index_file_path, ns=(mtime_ns, mtime_ns))
+    return index_file_path
+
+def _storage_stub(index_path, cold_mode:bool=False):
+    model = SimpleNamespace(resource_name_plural='tagged')
+    return SimpleNamespace(index_db=SimpleNamespace(models=[model]),
+                           rf_handler=SimpleNamespace(cold_mode=cold_mode, fs=SimpleNamespace(index=SimpleNamespace(path=str(index_path)))))
+
+@pytest.fixture
+def parsed_paths(monkeypatch):
+    # Records every file that is actually read and parsed instead of served from the cache
+    parsed = []
+    load_index_file = index_file_parsing._load_index_file
+    def recording_load(index_file_path):
+        parsed.append(os.path.basename(index_file_path))
+        return load_index_file(index_file_path)
+    monkeypatch.setattr(index_file_parsing, '_load_index_file', recording_load)
+    return parsed
+
+def _payloads(parsed_index_data) -> dict:
+    return {entry['base_data']['id']: entry['data']['payload'] for entry in parsed_index_data['tagged']}
+
+def test_index_cache_serves_unchanged_files(tmp_path, parsed_paths):
+    _write_index_file(tmp_path, 'a', 'first')
+    _write_index_file(tmp_path, 'b', 'second')
+    assert _payloads(index_file_parsing.parse_index_files(_storage_stub(tmp_path))) == {'a': 'first', 'b': 'second'}
+    assert sorted(parsed_paths) == ['a.json', 'b.json']
+    parsed_paths.clear()
+    assert _payloads(index_file_parsing.parse_index_files(_storage_stub(tmp_path))) == {'a': 'first', 'b': 'second'}
+    assert parsed_paths == []
+
+def test_index_cache_reparses_same_size_rewrites(tmp_path, parsed_paths):
+    _write_index_file(tmp_path, 'a', 'first')
+    index_file_parsing.parse_index_files(_storage_stub(tmp_path))
+    parsed_paths.clear()
+    # Same size, newer mtime
+    _write_index_file(tmp_path, 'a', 'fresh', mtime_ns=_AN_HOUR_AGO_NS + 1_000_000_000)
+    assert _payloads(index_file_parsing.parse_index_files(_storage_stub(tmp_path))) == {'a': 'fresh'}
+    assert parsed_paths == ['a.json']
+
+def test_index_cache_distrusts_files_modified_in_the_tick_of_the_cache(tmp_path, parsed_paths):
+    cache_tick_ns = time.time_ns()
+    _write_index_file(tmp_path, 'a', 'first', mtime_ns=cache_tick_ns)
+    index_file_parsing.parse_index_files(_storage_stub(tmp_path))
+    cache_path = tmp_path / index_file_parsing._CACHE_FILE_NAME
+    os.utime(cache_path, ns=(cache_tick_ns, cache_tick_ns))
+    parsed_paths.clear()
+    # Same size and the very same mtime, only the racy check can tell the rewrite apart
+    _write_index_file(tmp_path, 'a', 'fresh', mtime_ns=cache_tick_ns)
+    assert _payloads(index_file_parsing.parse_index_files(_storage_stub(tmp_path))) == {'a': 'fresh'}
+    assert parsed_paths == ['a.json']
+
+def test_index_cache_drops_deleted_files(tmp_path, parsed_paths):
+    _write_index_file(tmp_path, 'a', 'first')
+    deleted_path = _write_index_file(tmp_path, 'b', 'second')
+    index_file_parsing.parse_index_files(_storage_stub(tmp_path))
+    deleted_path.unlink()
+    assert _payloads(index_file_parsing.parse_index_files(_storage_stub(tmp_path))) == {'a': 'first'}
+    cache = json.loads((tmp_path / index_file_parsing._CACHE_FILE_NAME).read_text())
+    assert list(cache['entries']) == [str(tmp_path / 'tagged' / 'a.json')]
+
+def test_index_cache_with_another_version_is_discarded(tmp_path, parsed_paths):
+    _write_index_file(tmp_path, 'a', 'first')
+    index_file_parsing.parse_index_files(_storage_stub(tmp_path))
+    cache_path = tmp_path / index_file_parsing._CACHE_FILE_NAME
+    cache = json.loads(cache_path.read_text())
+    cache['version'] = index_file_parsing._CACHE_VERSION - 1
+    cache_path.write_text(json.dumps(cache))
+    parsed_paths.clear()
+    index_file_parsing.parse_index_files(_storage_stub(tmp_path))
+    assert parsed_paths == ['a.json']
+    assert json.loads(cache_path.read_text())['version'] == index_file_parsing._CACHE_VERSION
+
+def test_index_cache_is_not_written_in_cold_mode(tmp_path, parsed_paths):
+    _write_index_file(tmp_path, 'a', 'first')
+    index_file_parsing.parse_index_files(_storage_stub(tmp_path, cold_mode=True))
+    assert not (tmp_path / index_file_parsing._CACHE_FILE_NAME).exists()
+
+def test_index_cache_is_not_written_for_migrations(tmp_path, parsed_paths):
+    _write_index_file(tmp_path, 'a', 'first')
+    migrator = SimpleNamespace(models=[SimpleNamespace(resource_name_plural='tagged')],
+                               _index_path=str(tmp_path),
+                               _migration_data={'index': {}},
+                               _rejectpile={'index': {}})
+    assert _payloads(index_file_parsing.parse_index_files(migrator=migrator)) == {'a': 'first'}
+    assert not (tmp_path / index_file_parsing._CACHE_FILE_NAME).exists()